@@ -5,24 +5,21 @@ This test validates that the generated stubs provide correct types for:
 - Accessing list elements
 - Iterating over lists
 - Setting field values
+- Rejecting unknown attributes
 """
 
 from __future__ import annotations
 
-from pathlib import Path
+from typing import TYPE_CHECKING
 
 import pytest
 
-from tests.test_helpers import log_summary, run_pyright
+from tests.test_helpers import PyrightResult, log_summary, run_pyright_by_file, write_pyright_sample_project
 
-TESTS_DIR = Path(__file__).parent
+if TYPE_CHECKING:
+    from pathlib import Path
 
-
-def test_init_returns_typed_list(addressbook_stubs: Path) -> None:
-    """Test that init() returns a properly typed list, not Any."""
-    generated_dir = addressbook_stubs
-    # Create a test file that uses init
-    test_code = """
+_INIT_SAMPLE = """
 import addressbook_capnp
 
 addresses = addressbook_capnp.AddressBook.new_message()
@@ -37,31 +34,7 @@ alice.name = "Alice"  # Should type check
 alice.email = "alice@example.com"  # Should type check
 """
 
-    test_file = generated_dir / "test_typing_init.py"
-    test_file.write_text(test_code)
-
-    # Run pyright on the test file
-    result = run_pyright(test_file, cwd=TESTS_DIR)
-
-    error_count = result.stdout.count("error:")
-
-    if error_count > 0:
-        pytest.fail(
-            "".join(
-                (
-                    f"init() return type has {error_count} type errors.\n",
-                    f"Pyright output:\n{result.stdout}\n\n",
-                    "Expected: init() should return a typed list-like object\n",
-                    "Actual: Returns Any, causing downstream type errors",
-                ),
-            ),
-        )
-
-
-def test_list_element_access_typed(addressbook_stubs: Path) -> None:
-    """Test that accessing list elements gives proper types."""
-    generated_dir = addressbook_stubs
-    test_code = """
+_ELEMENTS_SAMPLE = """
 import addressbook_capnp
 
 addresses = addressbook_capnp.AddressBook.new_message()
@@ -79,30 +52,7 @@ bob_phones = bob.init("phones", 2)
 bob_phones[0].number = "555-4567"
 """
 
-    test_file = generated_dir / "test_typing_elements.py"
-    test_file.write_text(test_code)
-
-    result = run_pyright(test_file, cwd=TESTS_DIR)
-
-    error_count = result.stdout.count("error:")
-
-    if error_count > 0:
-        pytest.fail(
-            "".join(
-                (
-                    f"List element access has {error_count} type errors.\n",
-                    f"Pyright output:\n{result.stdout}\n\n",
-                    "Expected: people[0] should be PersonBuilder\n",
-                    "Actual: Type not properly inferred",
-                ),
-            ),
-        )
-
-
-def test_iteration_typed(addressbook_stubs: Path) -> None:
-    """Test that iterating over lists gives proper types."""
-    generated_dir = addressbook_stubs
-    test_code = """
+_ITERATION_SAMPLE = """
 import addressbook_capnp
 
 addresses = addressbook_capnp.AddressBook.read(open("example", "rb"))
@@ -120,49 +70,129 @@ for person in addresses.people:
         phone_type = phone.type
 """
 
-    test_file = generated_dir / "test_typing_iteration.py"
-    test_file.write_text(test_code)
+_UNIONS_SAMPLE = """
+import addressbook_capnp
+
+addresses = addressbook_capnp.AddressBook.new_message()
+people = addresses.init("people", 2)
+
+alice = people[0]
+# Setting union fields should type check
+alice.employment.school = "MIT"
+
+bob = people[1]
+bob.employment.unemployed = None
+"""
+
+_NESTED_INIT_SAMPLE = """
+import addressbook_capnp
+
+addresses = addressbook_capnp.AddressBook.new_message()
+people = addresses.init("people", 1)
+
+person = people[0]
+# Nested init should return typed list
+phones = person.init("phones", 2)
+
+# Should be able to access by index and set fields
+phones[0].number = "123"
+phones[0].type = "mobile"
+phones[1].number = "456"
+phones[1].type = "work"
+"""
+
+UNKNOWN_ATTRIBUTE_ERROR_COUNT = 2
+_UNKNOWN_ATTRIBUTE_SAMPLE = """
+import addressbook_capnp
+
+addresses = addressbook_capnp.AddressBook.new_message()
+people = addresses.init("people", 1)
 
-    result = run_pyright(test_file, cwd=TESTS_DIR)
+# Both assignments must be rejected; an untyped capnp base class would let them through.
+addresses.no_such_field = 3
+people[0].bogus = "x"
+"""
 
-    error_count = result.stdout.count("error:")
+_PYRIGHT_SAMPLES = {
+    "test_typing_init.py": _INIT_SAMPLE,
+    "test_typing_elements.py": _ELEMENTS_SAMPLE,
+    "test_typing_iteration.py": _ITERATION_SAMPLE,
+    "test_typing_unions.py": _UNIONS_SAMPLE,
+    "test_typing_nested_init.py": _NESTED_INIT_SAMPLE,
+    "test_typing_unknown_attribute.py": _UNKNOWN_ATTRIBUTE_SAMPLE,
+}
+
+
+@pytest.fixture(scope="module")
+def addressbook_pyright_results(
+    addressbook_stubs: Path,
+    tmp_path_factory: pytest.TempPathFactory,
+) -> dict[str, PyrightResult]:
+    """Type-check every addressbook sample with a single pyright run and key the results by sample filename."""
+    sample_dir = tmp_path_factory.mktemp("addressbook_pyright")
+    sample_files = write_pyright_sample_project(sample_dir, _PYRIGHT_SAMPLES, addressbook_stubs)
+    results = run_pyright_by_file(*sample_files, cwd=sample_dir)
+    return {sample_file.name: results[sample_file.resolve()] for sample_file in sample_files}
+
+
+def test_init_returns_typed_list(addressbook_pyright_results: dict[str, PyrightResult]) -> None:
+    """Test that init() returns a properly typed list, not Any."""
+    result = addressbook_pyright_results["test_typing_init.py"]
+    error_count = result.error_count
 
     if error_count > 0:
         pytest.fail(
             "".join(
                 (
-                    f"List iteration has {error_count} type errors.\n",
+                    f"init() return type has {error_count} type errors.\n",
                     f"Pyright output:\n{result.stdout}\n\n",
-                    "Expected: person should be PersonReader with proper fields\n",
-                    "Actual: Type not properly inferred",
+                    "Expected: init() should return a typed list-like object\n",
+                    "Actual: Returns Any, causing downstream type errors",
                 ),
             ),
         )
 
 
-def test_union_field_access(addressbook_stubs: Path) -> None:
-    """Test that union fields are properly typed."""
-    generated_dir = addressbook_stubs
-    test_code = """
-import addressbook_capnp
+def test_list_element_access_typed(addressbook_pyright_results: dict[str, PyrightResult]) -> None:
+    """Test that accessing list elements gives proper types."""
+    result = addressbook_pyright_results["test_typing_elements.py"]
+    error_count = result.error_count
 
-addresses = addressbook_capnp.AddressBook.new_message()
-people = addresses.init("people", 2)
+    if error_count > 0:
+        pytest.fail(
+            "".join(
+                (
+                    f"List element access has {error_count} type errors.\n",
+                    f"Pyright output:\n{result.stdout}\n\n",
+                    "Expected: people[0] should be PersonBuilder\n",
+                    "Actual: Type not properly inferred",
+                ),
+            ),
+        )
 
-alice = people[0]
-# Setting union fields should type check
-alice.employment.school = "MIT"
 
-bob = people[1]
-bob.employment.unemployed = None
-"""
+def test_iteration_typed(addressbook_pyright_results: dict[str, PyrightResult]) -> None:
+    """Test that iterating over lists gives proper types."""
+    result = addressbook_pyright_results["test_typing_iteration.py"]
+    error_count = result.error_count
 
-    test_file = generated_dir / "test_typing_unions.py"
-    test_file.write_text(test_code)
+    if error_count > 0:
+        pytest.fail(
+            "".join(
+                (
+                    f"List iteration has {error_count} type errors.\n",
+                    f"Pyright output:\n{result.stdout}\n\n",
+                    "Expected: person should be PersonReader with proper fields\n",
+                    "Actual: Type not properly inferred",
+                ),
+            ),
+        )
 
-    result = run_pyright(test_file, cwd=TESTS_DIR)
 
-    error_count = result.stdout.count("error:")
+def test_union_field_access(addressbook_pyright_results: dict[str, PyrightResult]) -> None:
+    """Test that union fields are properly typed."""
+    result = addressbook_pyright_results["test_typing_unions.py"]
+    error_count = result.error_count
 
     if error_count > 0:
         pytest.fail(
@@ -177,32 +207,10 @@ bob.employment.unemployed = None
         )
 
 
-def test_nested_init_typed(addressbook_stubs: Path) -> None:
+def test_nested_init_typed(addressbook_pyright_results: dict[str, PyrightResult]) -> None:
     """Test that nested init() calls return proper types."""
-    generated_dir = addressbook_stubs
-    test_code = """
-import addressbook_capnp
-
-addresses = addressbook_capnp.AddressBook.new_message()
-people = addresses.init("people", 1)
-
-person = people[0]
-# Nested init should return typed list
-phones = person.init("phones", 2)
-
-# Should be able to access by index and set fields
-phones[0].number = "123"
-phones[0].type = "mobile"
-phones[1].number = "456"
-phones[1].type = "work"
-"""
-
-    test_file = generated_dir / "test_typing_nested_init.py"
-    test_file.write_text(test_code)
-
-    result = run_pyright(test_file, cwd=TESTS_DIR)
-
-    error_count = result.stdout.count("error:")
+    result = addressbook_pyright_results["test_typing_nested_init.py"]
+    error_count = result.error_count
 
     if error_count > 0:
         pytest.fail(
@@ -217,6 +225,17 @@ phones[1].type = "work"
         )
 
 
+def test_unknown_attribute_rejected(addressbook_pyright_results: dict[str, PyrightResult]) -> None:
+    """Test that assigning an unknown field is a type error, so the checks above are not vacuous."""
+    result = addressbook_pyright_results["test_typing_unknown_attribute.py"]
+
+    assert result.error_count == UNKNOWN_ATTRIBUTE_ERROR_COUNT, (
+        f"Expected both unknown attributes to be rejected:\n{result.stdout}"
+    )
+    assert '"no_such_field"' in result.stdout
+    assert '"bogus"' in result.stdout
+
+
 def test_all_addressbook_typing_summary() -> None:
     """Provide a summary of addressbook typing tests."""
     log_summary(
@@ -228,5 +247,6 @@ def test_all_addressbook_typing_summary() -> None:
             "  ✓ Iteration provides correct types",
             "  ✓ Union fields are accessible",
             "  ✓ Nested init() calls are typed",
+            "  ✓ Unknown attributes are rejected",
         ],
     )
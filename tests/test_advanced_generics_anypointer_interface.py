@@ -68,7 +68,7 @@ def test_generics_anypointer_interface(basic_stubs: Path) -> None:
     assert "def innerBox(self)" in content, "innerBox field should exist"
 
     # Both should reference GenericBox (via Protocol or TypeAlias)
-    lines = content.split("\n")
+    lines = content.splitlines()
     generic_box_tokens = ("GenericBox", "_GenericBoxStructModule")
     assert _line_window_contains_any(lines, "def enumBox(self)", generic_box_tokens, lookahead=3), (
         "enumBox should be typed as GenericBox"
@@ -29,7 +29,7 @@ def test_name_annotations(basic_stubs: Path) -> None:
     )
 
     # Check for nested enum (original name)
-    lines = content.split("\n")
+    lines = content.splitlines()
     in_badname = False
     found_oops_enum = False
 
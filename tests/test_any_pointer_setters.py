@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from tests.test_helpers import read_generated_types_combined, run_pyright
+from tests.test_helpers import read_generated_types_combined, run_pyright, write_pyright_sample_project
 
 if TYPE_CHECKING:
     from pathlib import Path
@@ -33,7 +33,7 @@ def test_any_pointer_setters(basic_stubs: Path) -> None:
     assert "l: AnyList | Sequence[Any] | None = None" in content
 
 
-def test_any_pointer_type_checking(basic_stubs: Path) -> None:
+def test_any_pointer_type_checking(basic_stubs: Path, tmp_path: Path) -> None:
     """Test type checking for AnyPointer assignments."""
     test_code = """
 import any_pointer_capnp
@@ -56,9 +56,8 @@ def test_assignments():
     _ = any_pointer_capnp.AnyHolder.new_message(any="text")
 """
 
-    test_file = basic_stubs / "test_any_pointer_usage.py"
-    test_file.write_text(test_code)
+    [test_file] = write_pyright_sample_project(tmp_path, {"test_any_pointer_usage.py": test_code}, basic_stubs)
 
     # Run pyright
-    result = run_pyright(test_file)
+    result = run_pyright(test_file, cwd=tmp_path)
     assert result.returncode == 0, f"Type checking failed: {result.stdout}"
@@ -5,17 +5,13 @@ from __future__ import annotations
 import re
 from typing import TYPE_CHECKING
 
-from tests.test_helpers import read_generated_types_file
+from tests.test_helpers import class_block, read_generated_types_file
 
 if TYPE_CHECKING:
     from pathlib import Path
 
 
-def _class_block(content: str, class_name: str) -> str:
-    """Extract a top-level class block from one generated helper stub file."""
-    match = re.search(rf"class {re.escape(class_name)}\b.*?(?=\nclass |\Z)", content, re.DOTALL)
-    assert match, f"{class_name} not found"
-    return match.group(0)
+_SET_ANY_POINTER_PARAM_RE = re.compile(r"def setAnyPointer\(\s*self,\s*p: (?P<type>[^,\n]+),")
 
 
 class TestBuilderOwnedPointerFields:
@@ -27,7 +23,7 @@ class TestBuilderOwnedPointerFields:
     ) -> None:
         """AnyPointer, AnyStruct, and AnyList builder getters should all be object builders."""
         content = read_generated_types_file(basic_stubs / "any_pointer_capnp", "builders.pyi")
-        block = _class_block(content, "AnyHolderBuilder")
+        block = class_block(content, "AnyHolderBuilder")
 
         assert "def any(self) -> _DynamicObjectBuilder: ..." in block
         assert "def s(self) -> _DynamicObjectBuilder: ..." in block
@@ -39,7 +35,7 @@ class TestBuilderOwnedPointerFields:
     ) -> None:
         """Generic pointer fields on builders should use object builders too."""
         content = read_generated_types_file(zalfmas_stubs / "mas/schema/common/common_capnp", "builders.pyi")
-        block = _class_block(content, "PairBuilder")
+        block = class_block(content, "PairBuilder")
 
         assert "def fst(self) -> _DynamicObjectBuilder: ..." in block
         assert "def snd(self) -> _DynamicObjectBuilder: ..." in block
@@ -69,7 +65,7 @@ class TestInterfacePointerSurfaces:
         """Request objects should expose mutable builder getters but broad setter aliases."""
         package_dir = generated_stubs["examples"] / "restorer" / "restorer_capnp"
         content = read_generated_types_file(package_dir, "requests.pyi")
-        block = _class_block(content, "SetanypointerRequest")
+        block = class_block(content, "SetanypointerRequest")
 
         assert "def p(self) -> _DynamicObjectBuilder: ..." in block
         assert "def p(self, value: common.AnyPointer) -> None: ..." in block
@@ -78,11 +74,11 @@ class TestInterfacePointerSurfaces:
         """Server method params and CallContext.params should stay reader-facing."""
         package_dir = generated_stubs["examples"] / "restorer" / "restorer_capnp"
         contexts_content = read_generated_types_file(package_dir, "contexts.pyi")
-        params_block = _class_block(contexts_content, "SetanypointerParams")
+        params_block = class_block(contexts_content, "SetanypointerParams")
         assert "p: _DynamicObjectReader" in params_block
 
         modules_content = read_generated_types_file(package_dir, "modules.pyi")
-        match = re.search(r"def setAnyPointer\(\s*self,\s*p: (?P<type>[^,\n]+),", modules_content, re.DOTALL)
+        match = _SET_ANY_POINTER_PARAM_RE.search(modules_content)
         assert match, "setAnyPointer server signature not found"
         assert match.group("type") == "_DynamicObjectReader"
 
@@ -94,18 +90,18 @@ class TestInterfacePointerSurfaces:
         package_dir = generated_stubs["examples"] / "restorer" / "restorer_capnp"
         content = read_generated_types_file(package_dir, "results", "server.pyi")
 
-        any_struct_block = _class_block(content, "GetanystructServerResult")
+        any_struct_block = class_block(content, "GetanystructServerResult")
         assert "def s(self) -> _DynamicObjectBuilder: ..." in any_struct_block
         assert "def s(self, value: common.AnyStruct) -> None: ..." in any_struct_block
 
-        any_list_block = _class_block(content, "GetanylistServerResult")
+        any_list_block = class_block(content, "GetanylistServerResult")
         assert "def l(self) -> _DynamicObjectBuilder: ..." in any_list_block
         assert "def l(self, value: common.AnyList) -> None: ..." in any_list_block
 
-        any_pointer_block = _class_block(content, "GetanypointerServerResult")
+        any_pointer_block = class_block(content, "GetanypointerServerResult")
         assert "def p(self) -> _DynamicObjectBuilder: ..." in any_pointer_block
         assert "def p(self, value: common.AnyPointer) -> None: ..." in any_pointer_block
 
-        capability_block = _class_block(content, "RestoreServerResult")
+        capability_block = class_block(content, "RestoreServerResult")
         assert "def cap(self) -> _DynamicObjectBuilder: ..." in capability_block
         assert "def cap(self, value: common.Capability) -> None: ..." in capability_block
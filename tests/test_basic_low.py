@@ -6,43 +6,41 @@ from typing import TYPE_CHECKING
 
 import pytest
 
-from tests.test_helpers import read_generated_types_lines
+from tests.test_helpers import read_generated_types_combined
 
 if TYPE_CHECKING:
     from pathlib import Path
 
 
 @pytest.fixture(scope="module")
-def basic_low_stub_lines(basic_stubs: Path) -> list[str]:
-    """Read basic_low.capnp stub lines."""
-    return read_generated_types_lines(basic_stubs / "basic_low_capnp")
+def basic_low_stub_text(basic_stubs: Path) -> str:
+    """Read basic_low.capnp stub helpers as one string."""
+    return read_generated_types_combined(basic_stubs / "basic_low_capnp")
 
 
-def test_enum_color_defined(basic_low_stub_lines: list[str]) -> None:
+def test_enum_color_defined(basic_low_stub_text: str) -> None:
     """Test enum color defined."""
-    lines = basic_low_stub_lines
+    content = basic_low_stub_text
     # Enums are generated as _EnumModule-typed helper classes with int attributes.
-    assert any("class _ColorEnumModule(_EnumModule):" in line for line in lines)
+    assert "class _ColorEnumModule(_EnumModule):" in content
     # Enum values are int annotations
-    assert any("red: int" in line for line in lines)
-    assert any("green: int" in line for line in lines)
-    assert any("blue: int" in line for line in lines)
+    assert "red: int" in content
+    assert "green: int" in content
+    assert "blue: int" in content
     # Type alias at top level with Literal values
-    assert any('type ColorEnum = int | Literal["red", "green", "blue"]' in line for line in lines)
+    assert 'type ColorEnum = int | Literal["red", "green", "blue"]' in content
 
 
-def test_basiclow_struct_and_fields(basic_low_stub_lines: list[str]) -> None:
+def test_basiclow_struct_and_fields(basic_low_stub_text: str) -> None:
     """Test basiclow struct and fields."""
-    lines = basic_low_stub_lines
-    assert any("class _BasicLowStructModule(_StructModule):" in line for line in lines)
-    content = "".join(lines)
+    content = basic_low_stub_text
+    assert "class _BasicLowStructModule(_StructModule):" in content
     assert "name" in content
     assert "id" in content
 
 
-def test_builder_reader_presence(basic_low_stub_lines: list[str]) -> None:
+def test_builder_reader_presence(basic_low_stub_text: str) -> None:
     """Test builder reader presence."""
-    lines = basic_low_stub_lines
-    content = "".join(lines)
+    content = basic_low_stub_text
     assert "BasicLowBuilder" in content
     assert "BasicLowReader" in content
@@ -174,14 +174,14 @@ def test_bundled_base_stubs_match_typings_module() -> None:
     assert bundled_files == typings_files
 
     for relative_path in sorted(typings_files):
-        bundled_content = _normalize_stub(
-            relative_path,
-            (BUNDLED_STUBS_DIR / relative_path).read_text(encoding="utf8"),
-        )
-        typings_content = _normalize_stub(
-            relative_path,
-            (TYPINGS_STUBS_DIR / relative_path).read_text(encoding="utf8"),
-        )
+        bundled_file = BUNDLED_STUBS_DIR / relative_path
+        typings_file = TYPINGS_STUBS_DIR / relative_path
+        # Byte-identical files need neither decoding nor normalization.
+        if bundled_file.read_bytes() == typings_file.read_bytes():
+            continue
+
+        bundled_content = _normalize_stub(relative_path, bundled_file.read_text(encoding="utf8"))
+        typings_content = _normalize_stub(relative_path, typings_file.read_text(encoding="utf8"))
 
         assert bundled_content == typings_content, _diff_message(relative_path, bundled_content, typings_content)
 
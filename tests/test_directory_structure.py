@@ -2,33 +2,50 @@
 
 from __future__ import annotations
 
+import os
 import shutil
-import tempfile
 from pathlib import Path
-from typing import TYPE_CHECKING
 
 import pytest
 
 from tests.test_helpers import run_generator
 
-if TYPE_CHECKING:
-    from collections.abc import Iterator
-
 EXPECTED_GENERATED_PACKAGE_COUNT = 3
 
 
-@pytest.fixture
-def temp_schema_dir() -> Iterator[Path]:
-    """Create a temporary directory with nested schema structure."""
-    temp_dir = Path(tempfile.mkdtemp())
+def _collect_pyi(root: Path) -> set[str]:
+    """Collect output-relative POSIX paths of every generated `.pyi` file in one directory walk."""
+    return {
+        (Path(directory) / file_name).relative_to(root).as_posix()
+        for directory, _, file_names in os.walk(root)
+        for file_name in file_names
+        if file_name.endswith(".pyi")
+    }
+
+
+def _generated_packages(pyi_files: set[str]) -> set[str]:
+    """Return generated schema packages, ignoring bundled capnp and schema stubs."""
+    return {
+        path.removesuffix("/__init__.pyi")
+        for path in pyi_files
+        if path.endswith("_capnp/__init__.pyi") and "capnp-stubs" not in path and "schema_capnp" not in path
+    }
 
-    try:
-        # Create directory structure
-        (temp_dir / "subdir1").mkdir()
-        (temp_dir / "subdir2" / "nested").mkdir(parents=True)
 
-        # Create simple schemas with unique IDs
-        (temp_dir / "root.capnp").write_text("""
+@pytest.fixture(scope="module")
+def temp_schema_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Create a temporary directory with nested schema structure.
+
+    The schemas are only read by the generator, so one tree is shared by the whole module.
+    """
+    temp_dir = tmp_path_factory.mktemp("schemas")
+
+    # Create directory structure
+    (temp_dir / "subdir1").mkdir()
+    (temp_dir / "subdir2" / "nested").mkdir(parents=True)
+
+    # Create simple schemas with unique IDs
+    (temp_dir / "root.capnp").write_text("""
 @0xaabbccdd11223344;
 
 struct RootStruct {
@@ -36,7 +53,7 @@ struct RootStruct {
 }
 """)
 
-        (temp_dir / "subdir1" / "sub1.capnp").write_text("""
+    (temp_dir / "subdir1" / "sub1.capnp").write_text("""
 @0xbbccddee22334455;
 
 struct Sub1Struct {
@@ -44,7 +61,7 @@ struct Sub1Struct {
 }
 """)
 
-        (temp_dir / "subdir2" / "nested" / "deep.capnp").write_text("""
+    (temp_dir / "subdir2" / "nested" / "deep.capnp").write_text("""
 @0xccddff3344556677;
 
 struct DeepStruct {
@@ -52,57 +69,51 @@ struct DeepStruct {
 }
 """)
 
-        yield temp_dir
-    finally:
-        shutil.rmtree(temp_dir)
+    return temp_dir
 
 
 @pytest.fixture
-def temp_output_dir() -> Iterator[Path]:
-    """Create a temporary output directory."""
-    temp_dir = Path(tempfile.mkdtemp())
-    try:
-        yield temp_dir
-    finally:
-        shutil.rmtree(temp_dir)
+def temp_output_dir(tmp_path: Path) -> Path:
+    """Create a per-test output directory."""
+    output_dir = tmp_path / "output"
+    output_dir.mkdir()
+    return output_dir
 
 
-def test_directory_structure_preserved(temp_schema_dir: Path, temp_output_dir: Path) -> None:
-    """Test that input directory structure is preserved in output."""
-    # Get all schema files
+@pytest.fixture(scope="module")
+def all_schemas_output_dir(temp_schema_dir: Path, tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Generate stubs for every schema in the temporary tree once per module."""
+    output_dir = tmp_path_factory.mktemp("all_schemas_output")
     schema_files = [str(f) for f in temp_schema_dir.rglob("*.capnp")]
+    run_generator(schema_files, output_dir, skip_pyright=True)
+    return output_dir
 
-    # Generate stubs
-    args = ["-p", *schema_files, "-o", str(temp_output_dir), "--no-pyright"]
-    run_generator(args)
+
+def test_directory_structure_preserved(all_schemas_output_dir: Path) -> None:
+    """Test that input directory structure is preserved in output."""
+    pyi_files = _collect_pyi(all_schemas_output_dir)
 
     # Verify structure is preserved
-    assert (temp_output_dir / "root_capnp" / "__init__.pyi").exists()
-    assert (temp_output_dir / "subdir1" / "sub1_capnp" / "__init__.pyi").exists()
-    assert (temp_output_dir / "subdir2" / "nested" / "deep_capnp" / "__init__.pyi").exists()
+    assert "root_capnp/__init__.pyi" in pyi_files
+    assert "subdir1/sub1_capnp/__init__.pyi" in pyi_files
+    assert "subdir2/nested/deep_capnp/__init__.pyi" in pyi_files
 
     # Verify files are not flattened
-    assert not (temp_output_dir / "sub1_capnp" / "__init__.pyi").exists()
-    assert not (temp_output_dir / "deep_capnp" / "__init__.pyi").exists()
+    assert "sub1_capnp/__init__.pyi" not in pyi_files
+    assert "deep_capnp/__init__.pyi" not in pyi_files
 
 
 def test_directory_structure_with_glob(temp_schema_dir: Path, temp_output_dir: Path) -> None:
     """Test directory structure preservation with glob patterns."""
     # Use glob pattern
     pattern = str(temp_schema_dir / "**" / "*.capnp")
-    args = ["-p", pattern, "-o", str(temp_output_dir), "-r", "--no-pyright"]
-    run_generator(args)
+    run_generator([pattern], temp_output_dir, recursive=True, skip_pyright=True)
 
     # Count generated packages (directories with __init__.pyi files)
-    generated_packages = [
-        f.parent
-        for f in temp_output_dir.rglob("*_capnp/__init__.pyi")
-        if "capnp-stubs" not in str(f) and "schema_capnp" not in str(f)
-    ]
-    assert len(generated_packages) == EXPECTED_GENERATED_PACKAGE_COUNT  # root, sub1, deep
+    package_names = _generated_packages(_collect_pyi(temp_output_dir))
+    assert len(package_names) == EXPECTED_GENERATED_PACKAGE_COUNT  # root, sub1, deep
 
     # Verify structure
-    package_names = [str(p.relative_to(temp_output_dir)) for p in generated_packages]
     assert any("subdir1" in name for name in package_names)
     assert any("subdir2" in name for name in package_names)
 
@@ -111,8 +122,7 @@ def test_single_file_no_nested_structure(temp_schema_dir: Path, temp_output_dir:
     """Test that single file doesn't create unnecessary nesting."""
     # Generate stub for single file
     schema_file = str(temp_schema_dir / "root.capnp")
-    args = ["-p", schema_file, "-o", str(temp_output_dir), "--no-pyright"]
-    run_generator(args)
+    run_generator([schema_file], temp_output_dir, skip_pyright=True)
 
     # Should be directly in output dir (as package)
     assert (temp_output_dir / "root_capnp" / "__init__.pyi").exists()
@@ -122,33 +132,26 @@ def test_single_file_no_nested_structure(temp_schema_dir: Path, temp_output_dir:
 @pytest.mark.skip(
     reason="Plugin-based generation requires output directory; generating next to source is not currently supported",
 )
-def test_no_output_dir_places_next_to_source(temp_schema_dir: Path) -> None:
+def test_no_output_dir_places_next_to_source(temp_schema_dir: Path, tmp_path: Path) -> None:
     """Test that without -o flag, stubs are placed next to source files."""
-    schema_file = str(temp_schema_dir / "root.capnp")
-    args = ["-p", schema_file]
-    run_generator(args)
+    # Work on a copy so stubs written next to the sources never leak into the shared module tree
+    schema_dir = tmp_path / "schemas"
+    shutil.copytree(temp_schema_dir, schema_dir)
+    schema_file = str(schema_dir / "root.capnp")
+    run_generator([schema_file])
 
     # Stub should be next to source
-    assert (temp_schema_dir / "root_capnp" / "__init__.pyi").exists()
+    assert (schema_dir / "root_capnp" / "__init__.pyi").exists()
 
 
-def test_mixed_directory_levels(temp_schema_dir: Path, temp_output_dir: Path) -> None:
+def test_mixed_directory_levels(all_schemas_output_dir: Path) -> None:
     """Test with schemas at different directory levels."""
-    # Get all schemas
-    schema_files = [str(f) for f in temp_schema_dir.rglob("*.capnp")]
-
-    args = ["-p", *schema_files, "-o", str(temp_output_dir), "--no-pyright"]
-    run_generator(args)
+    pyi_files = _collect_pyi(all_schemas_output_dir)
 
     # All should be generated - check for package directories with __init__.pyi
-    all_packages = [
-        f.parent
-        for f in temp_output_dir.rglob("*_capnp/__init__.pyi")
-        if "capnp-stubs" not in str(f) and "schema_capnp" not in str(f)
-    ]
-    assert len(all_packages) == EXPECTED_GENERATED_PACKAGE_COUNT
+    assert len(_generated_packages(pyi_files)) == EXPECTED_GENERATED_PACKAGE_COUNT
 
     # Structure should match input - check for __init__.pyi in packages
-    assert (temp_output_dir / "root_capnp" / "__init__.pyi").exists()
-    assert (temp_output_dir / "subdir1" / "sub1_capnp" / "__init__.pyi").exists()
-    assert (temp_output_dir / "subdir2" / "nested" / "deep_capnp" / "__init__.pyi").exists()
+    assert "root_capnp/__init__.pyi" in pyi_files
+    assert "subdir1/sub1_capnp/__init__.pyi" in pyi_files
+    assert "subdir2/nested/deep_capnp/__init__.pyi" in pyi_files
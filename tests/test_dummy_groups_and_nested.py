@@ -1,54 +0,0 @@
-"""Tests for groups and nested type handling in dummy.capnp."""
-
-from __future__ import annotations
-
-import re
-
-MIN_GROUP_MEMBER_COUNT = 3
-
-
-def test_group_field_members_materialized(dummy_stub_lines: list[str]) -> None:
-    """Test group field members materialized."""
-    lines = dummy_stub_lines
-    # Ensure TestGroups appears and group members appear flattened or via nested classes
-    assert any("class _TestGroupsStructModule(_StructModule):" in line for line in lines)
-    # Look for group-specific field names (corge/grault/garply) multiple times (now as properties)
-    count_corge = sum(1 for line in lines if "def corge(self)" in line)
-    assert count_corge >= MIN_GROUP_MEMBER_COUNT  # across foo/bar/baz groups
-
-
-def test_interleaved_groups_union_and_nested_group_fields(dummy_stub_lines: list[str]) -> None:
-    """Test interleaved groups union and nested group fields."""
-    lines = dummy_stub_lines
-    assert any("class _TestInterleavedGroupsStructModule(_StructModule):" in line for line in lines)
-    # Expect nested group names or fields plugh/xyzzy/fred across two groups (now as properties)
-    found = dict.fromkeys(["plugh", "xyzzy", "fred", "waldo"], False)
-    for line in lines:
-        for k in found:
-            if f"def {k}(self)" in line:
-                found[k] = True
-    assert all(found.values())
-
-
-def test_nested_types_enums_and_lists(dummy_stub_lines: list[str]) -> None:
-    """Test nested types enums and lists."""
-    lines = dummy_stub_lines
-    # Nested enums are _EnumModule-typed helper classes under their parent struct with instance annotations.
-    assert any(re.match(r"^\s*class _NestedEnum1EnumModule\(_EnumModule\):", line) for line in lines)
-    assert any(re.match(r"^\s*class _NestedEnum2EnumModule\(_EnumModule\):", line) for line in lines)
-    assert any("NestedEnum1: _NestedEnum1EnumModule" in line for line in lines)
-    assert any("NestedEnum2: _NestedEnum2EnumModule" in line for line in lines)
-    # Using declarations produce aliases or reexports
-    assert any("class _TestUsingStructModule(_StructModule):" in line for line in lines)
-    # Fields referencing nested enums now return the Enum type alias
-    assert any("def outerNestedEnum(self) -> TestNestedTypesNestedEnum1Enum" in line for line in lines)
-    assert any("def innerNestedEnum(self) -> TestNestedTypesNestedStructNestedEnum2Enum" in line for line in lines)
-
-
-def test_using_type_aliases_resolved(dummy_stub_lines: list[str]) -> None:
-    """Test using type aliases resolved."""
-    lines = dummy_stub_lines
-    # OuterNestedEnum alias should result in field typing referencing original enum builder/reader variants
-    assert any("OuterNestedEnum" in line and "Literal" not in line for line in lines)
-    # Ensure the Using struct fields appear
-    assert any("class _TestUsingStructModule(_StructModule):" in line for line in lines)
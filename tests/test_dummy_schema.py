@@ -1,218 +1,312 @@
 """Consolidated tests for dummy.capnp schema covering all features.
 
-This consolidates the following test modules:
-- test_dummy_enums_and_all_types
-- test_dummy_lists_and_defaults
-- test_dummy_groups_and_nested
-- test_dummy_unions
-- test_dummy_constants_versions_names
+This is the single home for the enum/all-types, lists/defaults, groups/nested-type,
+union, and constants/versioning/name-annotation checks.
 """
 
 from __future__ import annotations
 
 import re
+from collections import Counter
+
+import pytest
+
+from tests.test_helpers import WHICH_LITERAL_RE
 
 MIN_GROUP_MEMBER_COUNT = 3
+TEST_ALL_TYPES_FIELDS = frozenset(
+    {"voidField", "boolField", "int8Field", "float64Field", "textField", "dataField", "enumField"},
+)
+TEST_LIST_DEFAULTS_FIELDS = frozenset({"list0", "list1", "list8"})
+TEST_LISTS_FIELDS = frozenset(
+    {
+        "list0",
+        "list1",
+        "list8",
+        "list16",
+        "list32",
+        "list64",
+        "listP",
+        "listlist0",
+        "listlist1",
+        "listlist8",
+        "listlist16",
+        "listlist32",
+        "listlist64",
+        "listlistP",
+        "list0c",
+        "list1c",
+        "list8c",
+        "list16c",
+        "list32c",
+        "list64c",
+        "listPc",
+        "int32ListList",
+        "textListList",
+        "structListList",
+    },
+)
+TEST_ENUM_MEMBER_LINES = frozenset({"foo: int", "bar: int", "baz: int", "qux: int"})
+INTERLEAVED_GROUP_FIELDS = frozenset({"plugh", "xyzzy", "fred", "waldo"})
+UNION_DEFAULTS_NEEDLES = (
+    "class _TestUnionDefaultsStructModule(_StructModule):",
+    "def s16s8s64s8Set(self)",
+    "def s0sps1s32Set(self)",
+    "def unnamed1(self)",
+    "def unnamed2(self)",
+)
+# `.` stops at newlines, so these only match when both tokens share one line.
+_NEW1_INT_RE = re.compile(r"def new1\(self\).*int")
+_NEW2_STR_RE = re.compile(r"def new2\(self\).*str")
+_SELF_METHOD_NAME_RE = re.compile(r"def (\w+)\(self\)")
+_SELF_METHOD_LINE_RE = re.compile(r"^.*?def (\w+)\(self\).*$", re.MULTILINE)
+_STRUCT_MODULE_NAME_RE = re.compile(r"class _(\w+)StructModule\(_StructModule\):")
+_CLASS_HEADER_RE = re.compile(r"^\s*class (\w+\(.*?\)):", re.MULTILINE)
+_FROM_IMPORT_RE = re.compile(r"^from ([\w.]+) import (?:\(([^)]*)\)|(.+))$", re.MULTILINE)
+
+
+@pytest.fixture(scope="module")
+def dummy_stub_imports(dummy_stub_text: str) -> dict[str, frozenset[str]]:
+    """Map each `from <module> import ...` source in the dummy helpers to the names it imports."""
+    imports: dict[str, set[str]] = {}
+    for module, grouped_names, inline_names in _FROM_IMPORT_RE.findall(dummy_stub_text):
+        names = imports.setdefault(module, set())
+        for name in (grouped_names or inline_names).split(","):
+            if name.strip():
+                names.add(name.split()[0])
+    return {module: frozenset(names) for module, names in imports.items()}
+
+
+@pytest.fixture(scope="module")
+def dummy_stub_class_headers(dummy_stub_text: str) -> frozenset[str]:
+    """Index every `class <Name>(<bases>):` header in the dummy helpers, at any nesting depth, as `<Name>(<bases>)`."""
+    return frozenset(_CLASS_HEADER_RE.findall(dummy_stub_text))
+
+
+@pytest.fixture(scope="module")
+def dummy_stub_struct_modules(dummy_stub_text: str) -> frozenset[str]:
+    """Collect the struct names behind every `class _<Name>StructModule(_StructModule):` in one regex pass."""
+    return frozenset(_STRUCT_MODULE_NAME_RE.findall(dummy_stub_text))
+
+
+@pytest.fixture(scope="module")
+def dummy_stub_def_counts(dummy_stub_text: str) -> Counter[str]:
+    """Count every `def <name>(self)` method name in the dummy helpers in one regex pass."""
+    return Counter(_SELF_METHOD_NAME_RE.findall(dummy_stub_text))
+
+
+@pytest.fixture(scope="module")
+def dummy_stub_def_names(dummy_stub_def_counts: Counter[str]) -> frozenset[str]:
+    """Return the distinct `def <name>(self)` method names in the dummy helpers."""
+    return frozenset(dummy_stub_def_counts)
+
+
+@pytest.fixture(scope="module")
+def dummy_stub_def_signatures(dummy_stub_text: str) -> dict[str, tuple[str, ...]]:
+    """Index every line declaring `def <name>(self)` in the dummy helpers by method name."""
+    signatures: dict[str, list[str]] = {}
+    for match in _SELF_METHOD_LINE_RE.finditer(dummy_stub_text):
+        signatures.setdefault(match.group(1), []).append(match.group(0))
+    return {name: tuple(lines) for name, lines in signatures.items()}
 
 
 class TestDummyEnumsAndTypes:
     """Tests for enum definitions and basic types."""
 
-    def test_enum_definition_and_imports(self, dummy_stub_lines: list[str]) -> None:
+    def test_enum_definition_and_imports(
+        self,
+        dummy_stub_text: str,
+        dummy_stub_class_headers: frozenset[str],
+    ) -> None:
         """Test enum definition and imports."""
-        lines = dummy_stub_lines
+        stripped_lines = frozenset(line.strip() for line in dummy_stub_text.splitlines())
         # Enums are _EnumModule-typed helper classes with int attributes.
-        assert any(line.strip().startswith("class _TestEnumEnumModule(_EnumModule):") for line in lines)
+        assert "_TestEnumEnumModule(_EnumModule)" in dummy_stub_class_headers
         # Type alias at top level (not instance annotation)
-        assert any(line.strip().startswith("type TestEnumEnum = int | Literal[") for line in lines)
-        for name in ["foo", "bar", "baz", "qux"]:
-            assert any(f"{name}: int" in line for line in lines)
-
-    def test_testalltypes_field_presence_and_collections_import(self, dummy_stub_lines: list[str]) -> None:
+        assert any(line.startswith("type TestEnumEnum = int | Literal[") for line in stripped_lines)
+        missing = TEST_ENUM_MEMBER_LINES - stripped_lines
+        assert not missing, f"Missing enum members {sorted(missing)}"
+
+    def test_testalltypes_field_presence_and_collections_import(
+        self,
+        dummy_stub_text: str,
+        dummy_stub_def_names: frozenset[str],
+        dummy_stub_def_signatures: dict[str, tuple[str, ...]],
+        dummy_stub_imports: dict[str, frozenset[str]],
+    ) -> None:
         """Test testalltypes field presence and collections import."""
-        lines = dummy_stub_lines
-        assert any(line.startswith("from collections.abc import") and "Sequence" in line for line in lines)
+        assert "Sequence" in dummy_stub_imports["collections.abc"]
         # Fields are now properties
-        for field in [
-            "voidField",
-            "boolField",
-            "int8Field",
-            "float64Field",
-            "textField",
-            "dataField",
-        ]:
-            assert any(f"def {field}(self)" in line for line in lines)
-        assert any("def structField(self)" in line and "TestAllTypes" in line for line in lines)
-        assert any("def enumField(self)" in line for line in lines)
+        missing = TEST_ALL_TYPES_FIELDS - dummy_stub_def_names
+        assert not missing, f"Missing fields {sorted(missing)}"
+        assert any("TestAllTypes" in signature for signature in dummy_stub_def_signatures["structField"])
+        # List field typing uses specific list classes
+        assert "def voidList(self) -> VoidListReader" in dummy_stub_text
+
+    def test_builder_reader_classes_for_all_types(
+        self, dummy_stub_text: str, dummy_stub_class_headers: frozenset[str]
+    ) -> None:
+        """Test builder reader classes for all types."""
+        # The precise typing-only classes are flattened to module top level.
+        assert "TestAllTypesReader(_DynamicStructReader)" in dummy_stub_class_headers
+        assert "TestAllTypesBuilder(_DynamicStructBuilder)" in dummy_stub_class_headers
+        # The runtime marker classes remain nested inside the struct module.
+        assert "Reader(_DynamicStructReader)" in dummy_stub_class_headers
+        assert "Builder(_DynamicStructBuilder)" in dummy_stub_class_headers
+        # Imports are now multiline, so check for individual imports
+        assert "_DynamicStructBuilder" in dummy_stub_text
+        assert "_DynamicStructReader" in dummy_stub_text
+        assert "_StructModule" in dummy_stub_text
 
 
 class TestDummyListsAndDefaults:
     """Tests for list handling and default values."""
 
-    def test_lists_small_struct_and_listlist_fields(self, dummy_stub_lines: list[str]) -> None:
+    def test_lists_small_struct_and_listlist_fields(
+        self,
+        dummy_stub_def_names: frozenset[str],
+        dummy_stub_struct_modules: frozenset[str],
+    ) -> None:
         """Test lists small struct and listlist fields."""
-        lines = dummy_stub_lines
-        assert any("class _TestListsStructModule(_StructModule):" in line for line in lines)
+        assert "TestLists" in dummy_stub_struct_modules
         # Fields are now properties - check for def fieldname(self)
-        for field in [
-            "list0",
-            "list1",
-            "list8",
-            "list16",
-            "list32",
-            "list64",
-            "listP",
-            "listlist0",
-            "listlist1",
-            "listlist8",
-            "listlist16",
-            "listlist32",
-            "listlist64",
-            "listlistP",
-            "list0c",
-            "list1c",
-            "list8c",
-            "list16c",
-            "list32c",
-            "list64c",
-            "listPc",
-            "int32ListList",
-            "textListList",
-            "structListList",
-        ]:
-            assert any(f"def {field}(self)" in line for line in lines), f"Missing field {field}"
-
-    def test_list_defaults_struct_and_scalar_lists_present(self, dummy_stub_lines: list[str]) -> None:
+        missing = TEST_LISTS_FIELDS - dummy_stub_def_names
+        assert not missing, f"Missing fields {sorted(missing)}"
+
+    def test_list_defaults_struct_and_scalar_lists_present(
+        self,
+        dummy_stub_def_names: frozenset[str],
+        dummy_stub_struct_modules: frozenset[str],
+    ) -> None:
         """Test list defaults struct and scalar lists present."""
-        lines = dummy_stub_lines
-        assert any("class _TestListDefaultsStructModule(_StructModule):" in line for line in lines)
+        assert "TestListDefaults" in dummy_stub_struct_modules
         # Fields are now properties
-        for field in ["list0", "list1", "list8"]:
-            assert any(f"def {field}(self)" in line for line in lines), f"Missing field {field}"
-
-    def test_field_zero_bit_and_defaults(self, dummy_stub_lines: list[str]) -> None:
+        missing = TEST_LIST_DEFAULTS_FIELDS - dummy_stub_def_names
+        assert not missing, f"Missing fields {sorted(missing)}"
+
+    def test_field_zero_bit_and_defaults(
+        self,
+        dummy_stub_def_signatures: dict[str, tuple[str, ...]],
+        dummy_stub_struct_modules: frozenset[str],
+    ) -> None:
         """Test field zero bit and defaults."""
-        lines = dummy_stub_lines
-        assert any("class _TestFieldZeroIsBitStructModule(_StructModule):" in line for line in lines)
+        assert "TestFieldZeroIsBit" in dummy_stub_struct_modules
         # Fields are now properties
-        assert any("def bit(self)" in line and "bool" in line for line in lines)
-        assert any("def secondBit(self)" in line and "bool" in line for line in lines)
-        assert any("def thirdField(self)" in line and "int" in line for line in lines)
+        assert any("bool" in signature for signature in dummy_stub_def_signatures["bit"])
+        assert any("bool" in signature for signature in dummy_stub_def_signatures["secondBit"])
+        assert any("int" in signature for signature in dummy_stub_def_signatures["thirdField"])
 
 
 class TestDummyGroupsAndNested:
     """Tests for groups and nested type handling."""
 
-    def test_group_field_members_materialized(self, dummy_stub_lines: list[str]) -> None:
+    def test_group_field_members_materialized(
+        self,
+        dummy_stub_def_counts: Counter[str],
+        dummy_stub_struct_modules: frozenset[str],
+    ) -> None:
         """Test group field members materialized."""
-        lines = dummy_stub_lines
-        assert any("class _TestGroupsStructModule(_StructModule):" in line for line in lines)
+        assert "TestGroups" in dummy_stub_struct_modules
         # Fields are now properties
-        count_corge = sum(1 for line in lines if "def corge(self)" in line)
-        assert count_corge >= MIN_GROUP_MEMBER_COUNT  # across foo/bar/baz groups
+        assert dummy_stub_def_counts["corge"] >= MIN_GROUP_MEMBER_COUNT  # across foo/bar/baz groups
 
-    def test_interleaved_groups_union_and_nested_group_fields(self, dummy_stub_lines: list[str]) -> None:
+    def test_interleaved_groups_union_and_nested_group_fields(
+        self,
+        dummy_stub_def_names: frozenset[str],
+        dummy_stub_struct_modules: frozenset[str],
+    ) -> None:
         """Test interleaved groups union and nested group fields."""
-        lines = dummy_stub_lines
-        assert any("class _TestInterleavedGroupsStructModule(_StructModule):" in line for line in lines)
+        assert "TestInterleavedGroups" in dummy_stub_struct_modules
         # Fields are now properties
-        found = dict.fromkeys(["plugh", "xyzzy", "fred", "waldo"], False)
-        for line in lines:
-            for k in found:
-                if f"def {k}(self)" in line:
-                    found[k] = True
-        assert all(found.values())
-
-    def test_nested_types_enums_and_lists(self, dummy_stub_lines: list[str]) -> None:
+        missing = INTERLEAVED_GROUP_FIELDS - dummy_stub_def_names
+        assert not missing, f"Missing interleaved group fields {sorted(missing)}"
+
+    def test_nested_types_enums_and_lists(
+        self,
+        dummy_stub_text: str,
+        dummy_stub_struct_modules: frozenset[str],
+        dummy_stub_class_headers: frozenset[str],
+    ) -> None:
         """Test nested types enums and lists."""
-        lines = dummy_stub_lines
-        assert any(re.match(r"^\s*class _NestedEnum1EnumModule\(_EnumModule\):", line) for line in lines)
-        assert any(re.match(r"^\s*class _NestedEnum2EnumModule\(_EnumModule\):", line) for line in lines)
-        assert any("NestedEnum1: _NestedEnum1EnumModule" in line for line in lines)
-        assert any("NestedEnum2: _NestedEnum2EnumModule" in line for line in lines)
-        assert any("class _TestUsingStructModule(_StructModule):" in line for line in lines)
+        assert "_NestedEnum1EnumModule(_EnumModule)" in dummy_stub_class_headers
+        assert "_NestedEnum2EnumModule(_EnumModule)" in dummy_stub_class_headers
+        assert "NestedEnum1: _NestedEnum1EnumModule" in dummy_stub_text
+        assert "NestedEnum2: _NestedEnum2EnumModule" in dummy_stub_text
+        assert "TestUsing" in dummy_stub_struct_modules
         # Enum fields now return the Enum type alias
-        assert any("def outerNestedEnum(self) -> TestNestedTypesNestedEnum1Enum" in line for line in lines)
-        assert any("def innerNestedEnum(self) -> TestNestedTypesNestedStructNestedEnum2Enum" in line for line in lines)
+        assert "def outerNestedEnum(self) -> TestNestedTypesNestedEnum1Enum" in dummy_stub_text
+        assert "def innerNestedEnum(self) -> TestNestedTypesNestedStructNestedEnum2Enum" in dummy_stub_text
 
-    def test_using_type_aliases_resolved(self, dummy_stub_lines: list[str]) -> None:
+    def test_using_type_aliases_resolved(self, dummy_stub_text: str, dummy_stub_struct_modules: frozenset[str]) -> None:
         """Test using type aliases resolved."""
-        lines = dummy_stub_lines
-        assert any("OuterNestedEnum" in line and "Literal" not in line for line in lines)
-        assert any("class _TestUsingStructModule(_StructModule):" in line for line in lines)
+        assert any("OuterNestedEnum" in line and "Literal" not in line for line in dummy_stub_text.splitlines())
+        assert "TestUsing" in dummy_stub_struct_modules
 
 
 class TestDummyUnions:
     """Tests for union-related features."""
 
-    def test_union_which_methods_and_literal_import(self, dummy_stub_lines: list[str]) -> None:
+    def test_union_which_methods_and_literal_import(
+        self, dummy_stub_text: str, dummy_stub_imports: dict[str, frozenset[str]]
+    ) -> None:
         """Test union which methods and literal import."""
-        lines = dummy_stub_lines
-        assert any(re.match(r"^\s*def which\(self\) -> Literal\[", line) for line in lines)
-        assert any(line.startswith("from typing import") and "Literal" in line for line in lines)
-
-    def test_unnamed_union_fields_present(self, dummy_stub_lines: list[str]) -> None:
+        assert WHICH_LITERAL_RE.search(dummy_stub_text)
+        assert "Literal" in dummy_stub_imports["typing"]
+
+    def test_unnamed_union_fields_present(
+        self,
+        dummy_stub_def_signatures: dict[str, tuple[str, ...]],
+        dummy_stub_struct_modules: frozenset[str],
+    ) -> None:
         """Test unnamed union fields present."""
-        lines = dummy_stub_lines
-        assert any("class _TestUnnamedUnionStructModule(_StructModule):" in line for line in lines)
+        assert "TestUnnamedUnion" in dummy_stub_struct_modules
         # Fields are now properties
-        assert any("def foo(self)" in line and "int" in line for line in lines) or any(
-            "def foo(self)" in line and "Optional" in line for line in lines
-        )
-        assert any("def bar(self)" in line and "int" in line for line in lines) or any(
-            "def bar(self)" in line and "Optional" in line for line in lines
-        )
-
-    def test_interleaved_union_discriminants_sorted(self, dummy_stub_lines: list[str]) -> None:
+        assert any("int" in signature or "Optional" in signature for signature in dummy_stub_def_signatures["foo"])
+        assert any("int" in signature or "Optional" in signature for signature in dummy_stub_def_signatures["bar"])
+
+    def test_interleaved_union_discriminants_sorted(self, dummy_stub_text: str) -> None:
         """Test interleaved union discriminants sorted."""
-        lines = dummy_stub_lines
-        which_methods = [line for line in lines if "def which" in line and "Literal" in line]
-        assert which_methods
+        assert WHICH_LITERAL_RE.search(dummy_stub_text)
 
-    def test_union_defaults_struct_initializers_present(self, dummy_stub_lines: list[str]) -> None:
+    def test_union_defaults_struct_initializers_present(self, dummy_stub_text: str) -> None:
         """Test union defaults struct initializers present."""
-        lines = dummy_stub_lines
-        assert any("class _TestUnionDefaultsStructModule(_StructModule):" in line for line in lines)
         # Fields are now properties
-        assert any("def s16s8s64s8Set(self)" in line for line in lines)
-        assert any("def s0sps1s32Set(self)" in line for line in lines)
-        assert any("def unnamed1(self)" in line for line in lines)
-        assert any("def unnamed2(self)" in line for line in lines)
+        missing = [needle for needle in UNION_DEFAULTS_NEEDLES if needle not in dummy_stub_text]
+        assert not missing, f"Missing union default members: {missing}"
 
 
 class TestDummyConstantsAndVersioning:
     """Tests for constants, versioned structs, and name annotations."""
 
-    def test_global_constants_and_derived_constant_present(self, dummy_stub_lines: list[str]) -> None:
+    def test_global_constants_and_derived_constant_present(self, dummy_stub_text: str) -> None:
         """Test global constants and derived constant present."""
-        lines = dummy_stub_lines
         # Constants remain as simple annotations (not properties)
-        assert any("globalInt:" in line for line in lines)
-        assert any("globalText:" in line for line in lines)
+        assert "globalInt:" in dummy_stub_text
+        assert "globalText:" in dummy_stub_text
 
-    def test_struct_constants_section(self, dummy_stub_lines: list[str]) -> None:
+    def test_struct_constants_section(self, dummy_stub_struct_modules: frozenset[str]) -> None:
         """Test struct constants section."""
-        lines = dummy_stub_lines
-        assert any("class _TestConstantsStructModule(_StructModule):" in line for line in lines)
+        assert "TestConstants" in dummy_stub_struct_modules
 
-    def test_versioned_structs_fields_and_defaults(self, dummy_stub_lines: list[str]) -> None:
+    def test_versioned_structs_fields_and_defaults(
+        self, dummy_stub_text: str, dummy_stub_struct_modules: frozenset[str]
+    ) -> None:
         """Test versioned structs fields and defaults."""
-        lines = dummy_stub_lines
-        assert any("class _TestOldVersionStructModule(_StructModule):" in line for line in lines)
-        assert any("class _TestNewVersionStructModule(_StructModule):" in line for line in lines)
+        assert "TestOldVersion" in dummy_stub_struct_modules
+        assert "TestNewVersion" in dummy_stub_struct_modules
         # Fields are now properties
-        assert any("def new1(self)" in line and "int" in line for line in lines)
-        assert any("def new2(self)" in line and "str" in line for line in lines)
+        assert _NEW1_INT_RE.search(dummy_stub_text)
+        assert _NEW2_STR_RE.search(dummy_stub_text)
 
-    def test_name_annotations_renamed_struct_enum_fields(self, dummy_stub_lines: list[str]) -> None:
+    def test_name_annotations_renamed_struct_enum_fields(
+        self, dummy_stub_text: str, dummy_stub_struct_modules: frozenset[str]
+    ) -> None:
         """Test name annotations renamed struct enum fields."""
-        lines = dummy_stub_lines
-        assert any("class _TestNameAnnotationStructModule(_StructModule):" in line for line in lines)
-        assert any("class _BadlyNamedEnumEnumModule(_EnumModule):" in line for line in lines)
-        assert any("BadlyNamedEnum: _BadlyNamedEnumEnumModule" in line for line in lines)
-        assert any("badFieldName" in line or "bar" in line for line in lines)
+        assert "TestNameAnnotation" in dummy_stub_struct_modules
+        assert "class _BadlyNamedEnumEnumModule(_EnumModule):" in dummy_stub_text
+        assert "BadlyNamedEnum: _BadlyNamedEnumEnumModule" in dummy_stub_text
+        assert "badFieldName" in dummy_stub_text or "bar" in dummy_stub_text
 
-    def test_empty_struct_representation(self, dummy_stub_lines: list[str]) -> None:
+    def test_empty_struct_representation(self, dummy_stub_struct_modules: frozenset[str]) -> None:
         """Test empty struct representation."""
-        lines = dummy_stub_lines
-        assert any("class _TestEmptyStructStructModule(_StructModule):" in line for line in lines)
+        assert "TestEmptyStruct" in dummy_stub_struct_modules
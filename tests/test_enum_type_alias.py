@@ -1,53 +1,13 @@
 """Test enum type alias generation and usage."""
 
+import re
 from pathlib import Path
 
-from tests.test_helpers import CommandResult, read_generated_types_combined, run_pyright
+import pytest
 
+from tests.test_helpers import PyrightResult, run_pyright_by_file, write_pyright_sample_project
 
-def _run_pyright_sample(calculator_stubs: Path, filename: str, test_code: str) -> CommandResult:
-    test_file = calculator_stubs / filename
-    test_file.write_text(test_code)
-    try:
-        return run_pyright(test_file)
-    finally:
-        test_file.unlink(missing_ok=True)
-
-
-def test_enum_type_alias_exists(calculator_stubs: Path) -> None:
-    """Test that enum type aliases are generated."""
-    content = read_generated_types_combined(calculator_stubs / "calculator_capnp")
-
-    # Check that the enum type alias exists (flattened name)
-    assert 'type CalculatorOperatorEnum = int | Literal["add", "subtract", "multiply", "divide"]' in content
-
-
-def test_enum_type_alias_accepts_literals(calculator_stubs: Path) -> None:
-    """Test that the Operator type accepts string literals."""
-    test_code = '''
-import calculator_capnp
-from calculator_capnp.types.enums import CalculatorOperatorEnum
-
-def use_operator_literal(op: CalculatorOperatorEnum):
-    """Function that accepts Operator."""
-    pass
-
-# Should accept string literals
-use_operator_literal("add")
-use_operator_literal("subtract")
-use_operator_literal("multiply")
-use_operator_literal("divide")
-'''
-
-    result = _run_pyright_sample(calculator_stubs, "test_enum_literal_typing.py", test_code)
-
-    error_count = result.stdout.count("error:")
-    assert error_count == 0, f"Type checking failed: {result.stdout}"
-
-
-def test_enum_type_alias_accepts_int(calculator_stubs: Path) -> None:
-    """Test that the Operator accepts integer values."""
-    test_code = '''
+_ENUM_INT_TYPING_SAMPLE = '''
 import calculator_capnp
 from calculator_capnp.types.enums import CalculatorOperatorEnum
 
@@ -62,15 +22,7 @@ use_operator_int(2)
 use_operator_int(3)
 '''
 
-    result = _run_pyright_sample(calculator_stubs, "test_enum_int_typing.py", test_code)
-
-    error_count = result.stdout.count("error:")
-    assert error_count == 0, f"Type checking failed: {result.stdout}"
-
-
-def test_enum_type_alias_accepts_enum_attribute(calculator_stubs: Path) -> None:
-    """Test that the Operator accepts enum dot notation."""
-    test_code = '''
+_ENUM_ATTR_TYPING_SAMPLE = '''
 import calculator_capnp
 from calculator_capnp.types.enums import CalculatorOperatorEnum
 
@@ -85,15 +37,7 @@ use_operator_enum(calculator_capnp.Calculator.Operator.multiply)
 use_operator_enum(calculator_capnp.Calculator.Operator.divide)
 '''
 
-    result = _run_pyright_sample(calculator_stubs, "test_enum_attr_typing.py", test_code)
-
-    error_count = result.stdout.count("error:")
-    assert error_count == 0, f"Type checking failed: {result.stdout}"
-
-
-def test_enum_type_alias_rejects_invalid_literals(calculator_stubs: Path) -> None:
-    """Test that the Operator rejects invalid string literals."""
-    test_code = '''
+_ENUM_INVALID_TYPING_SAMPLE = '''
 import calculator_capnp
 from calculator_capnp.types.enums import CalculatorOperatorEnum
 
@@ -105,14 +49,7 @@ def use_operator(op: CalculatorOperatorEnum):
 use_operator("invalid")
 '''
 
-    result = _run_pyright_sample(calculator_stubs, "test_enum_invalid_typing.py", test_code)
-    error_count = result.stdout.count("error:")
-    assert error_count == 1, f"Type checking should reject one invalid literal:\n{result.stdout}"
-
-
-def test_enum_type_alias_in_class_init(calculator_stubs: Path) -> None:
-    """Test using Operator in a class __init__ method (real-world example)."""
-    test_code = '''
+_ENUM_CLASS_TYPING_SAMPLE = '''
 import calculator_capnp
 from calculator_capnp.types.enums import CalculatorOperatorEnum
 
@@ -144,15 +81,7 @@ impl2 = OperatorImpl(calculator_capnp.Calculator.Operator.subtract)
 impl3 = OperatorImpl(0)
 '''
 
-    result = _run_pyright_sample(calculator_stubs, "test_enum_class_typing.py", test_code)
-
-    error_count = result.stdout.count("error:")
-    assert error_count == 0, f"Type checking failed: {result.stdout}"
-
-
-def test_enum_comparison_with_literals(calculator_stubs: Path) -> None:
-    """Test that enum values can be compared with string literals."""
-    test_code = '''
+_ENUM_COMPARISON_TYPING_SAMPLE = '''
 import calculator_capnp
 from calculator_capnp.types.enums import CalculatorOperatorEnum
 
@@ -175,7 +104,77 @@ result2 = process_operator(calculator_capnp.Calculator.Operator.add)
 result3 = process_operator(0)
 '''
 
-    result = _run_pyright_sample(calculator_stubs, "test_enum_comparison_typing.py", test_code)
+_PYRIGHT_SAMPLES = {
+    "test_enum_int_typing.py": _ENUM_INT_TYPING_SAMPLE,
+    "test_enum_attr_typing.py": _ENUM_ATTR_TYPING_SAMPLE,
+    "test_enum_invalid_typing.py": _ENUM_INVALID_TYPING_SAMPLE,
+    "test_enum_class_typing.py": _ENUM_CLASS_TYPING_SAMPLE,
+    "test_enum_comparison_typing.py": _ENUM_COMPARISON_TYPING_SAMPLE,
+}
+
+
+@pytest.fixture(scope="module")
+def enum_pyright_results(
+    calculator_stubs: Path,
+    tmp_path_factory: pytest.TempPathFactory,
+) -> dict[str, PyrightResult]:
+    """Type-check every enum sample with a single pyright run and key the results by sample filename."""
+    sample_dir = tmp_path_factory.mktemp("enum_pyright")
+    sample_files = write_pyright_sample_project(sample_dir, _PYRIGHT_SAMPLES, calculator_stubs)
+    results = run_pyright_by_file(*sample_files, cwd=sample_dir)
+    return {sample_file.name: results[sample_file.resolve()] for sample_file in sample_files}
+
 
-    error_count = result.stdout.count("error:")
+def test_enum_type_alias_exists(calculator_stub_text: str) -> None:
+    """Test that enum type aliases are generated."""
+    # Check that the enum type alias exists (flattened name)
+    assert (
+        'type CalculatorOperatorEnum = int | Literal["add", "subtract", "multiply", "divide"]' in calculator_stub_text
+    )
+
+
+def test_enum_type_alias_accepts_literals(calculator_stub_text: str) -> None:
+    """Test that the Operator type accepts string literals.
+
+    Pyright-free: the alias spells out every literal, so the union is checked directly. The class-init and
+    comparison tests below still pass literals through the alias under pyright.
+    """
+    match = re.search(r"^\s*type CalculatorOperatorEnum = (?P<members>.+)$", calculator_stub_text, re.MULTILINE)
+    assert match, "CalculatorOperatorEnum alias not found"
+    members = {member.strip() for member in match.group("members").split("|")}
+    assert 'Literal["add", "subtract", "multiply", "divide"]' in members
+
+
+def test_enum_type_alias_accepts_int(enum_pyright_results: dict[str, PyrightResult]) -> None:
+    """Test that the Operator accepts integer values."""
+    result = enum_pyright_results["test_enum_int_typing.py"]
+    error_count = result.error_count
+    assert error_count == 0, f"Type checking failed: {result.stdout}"
+
+
+def test_enum_type_alias_accepts_enum_attribute(enum_pyright_results: dict[str, PyrightResult]) -> None:
+    """Test that the Operator accepts enum dot notation."""
+    result = enum_pyright_results["test_enum_attr_typing.py"]
+    error_count = result.error_count
+    assert error_count == 0, f"Type checking failed: {result.stdout}"
+
+
+def test_enum_type_alias_rejects_invalid_literals(enum_pyright_results: dict[str, PyrightResult]) -> None:
+    """Test that the Operator rejects invalid string literals."""
+    result = enum_pyright_results["test_enum_invalid_typing.py"]
+    error_count = result.error_count
+    assert error_count == 1, f"Type checking should reject one invalid literal:\n{result.stdout}"
+
+
+def test_enum_type_alias_in_class_init(enum_pyright_results: dict[str, PyrightResult]) -> None:
+    """Test using Operator in a class __init__ method (real-world example)."""
+    result = enum_pyright_results["test_enum_class_typing.py"]
+    error_count = result.error_count
+    assert error_count == 0, f"Type checking failed: {result.stdout}"
+
+
+def test_enum_comparison_with_literals(enum_pyright_results: dict[str, PyrightResult]) -> None:
+    """Test that enum values can be compared with string literals."""
+    result = enum_pyright_results["test_enum_comparison_typing.py"]
+    error_count = result.error_count
     assert error_count == 0, f"Type checking failed: {result.stdout}"
@@ -3,25 +3,26 @@
 from __future__ import annotations
 
 import re
-from pathlib import Path
+from typing import TYPE_CHECKING
 
-from tests.test_helpers import read_generated_types_lines
+from tests.test_helpers import WHICH_LITERAL_RE, read_generated_types_combined
 
-here = Path(__file__).parent
-generated_dir = here / "_generated" / "basic"
+if TYPE_CHECKING:
+    from pathlib import Path
 
+TYPING_IMPORT_RE = re.compile(r"^from typing import (.*)$", re.MULTILINE)
+_KIND_ENUM_MODULE_RE = re.compile(r"^\s*class _KindEnumModule\(_EnumModule\):", re.MULTILINE)
+_SHARED_IMPORT_RE = re.compile(r"^from .*(?:import _SharedStructModule|SharedReader)", re.MULTILINE)
 
-def _get_stub_path(schema: str) -> Path:
-    """Get path to a pre-generated schema package."""
-    stub_name = f"{Path(schema).stem}_capnp"
-    return generated_dir / stub_name
 
+def _typing_import_names(content: str) -> frozenset[str]:
+    """Collect every name imported from ``typing`` across the joined stub text."""
+    return frozenset(name.strip() for names in TYPING_IMPORT_RE.findall(content) for name in names.split(","))
 
-def test_primitives_and_lists_imports_and_types() -> None:
+
+def test_primitives_and_lists_imports_and_types(basic_stubs: Path) -> None:
     """Test primitives and lists imports and types."""
-    stub_path = _get_stub_path("primitives.capnp")
-    lines = read_generated_types_lines(stub_path)
-    content = "".join(lines)
+    content = read_generated_types_combined(basic_stubs / "primitives_capnp")
     # Note: from __future__ import annotations is not needed with Python 3.10+ type annotations
     # Sequence and MutableSequence appear (list fields) from collections.abc
     # Note: With specific list classes, Sequence is only used for nested lists or setters
@@ -32,42 +33,38 @@ def test_primitives_and_lists_imports_and_types() -> None:
     assert "Literal" in content
     assert "overload" in content
     # Basic field annotations present (now as properties)
-    assert any("def aBool(self) -> bool" in line for line in lines)
+    assert "def aBool(self) -> bool" in content
     # List fields use specific list classes
-    assert any("def ints(self) -> Int32ListReader" in line for line in lines)
+    assert "def ints(self) -> Int32ListReader" in content
 
 
-def test_nested_enum_and_literal_and_overload() -> None:
+def test_nested_enum_and_literal_and_overload(basic_stubs: Path) -> None:
     """Test nested enum and literal and overload."""
-    stub_path = _get_stub_path("nested.capnp")
-    lines = read_generated_types_lines(stub_path)
+    content = read_generated_types_combined(basic_stubs / "nested_capnp")
     # Enum should now be an _EnumModule-typed helper class with int annotations.
-    assert any(re.match(r"^\s*class _KindEnumModule\(_EnumModule\):", line) for line in lines)
-    assert any("Kind: _KindEnumModule" in line for line in lines)
+    assert _KIND_ENUM_MODULE_RE.search(content)
+    assert "Kind: _KindEnumModule" in content
     # Sequence import still expected for list fields (only for nested lists or setters)
     # Now overload is expected (for list init overloads)
-    assert any("overload" in line for line in lines if line.startswith("from typing import"))
+    assert "overload" in _typing_import_names(content)
 
 
-def test_unions_literal_and_overload_and_which() -> None:
+def test_unions_literal_and_overload_and_which(basic_stubs: Path) -> None:
     """Test unions literal and overload and which."""
-    stub_path = _get_stub_path("unions.capnp")
-    lines = read_generated_types_lines(stub_path)
+    content = read_generated_types_combined(basic_stubs / "unions_capnp")
     # Expect Literal import (union which methods)
-    assert any(line.startswith("from typing import") and "Literal" in line for line in lines)
+    assert "Literal" in _typing_import_names(content)
     # Overload is only imported when there are multiple init methods (2+)
     # unions.capnp doesn't have multiple init methods, so no overload import
     # 'which' function should appear for discriminantCount > 0
-    assert any(re.match(r"^\s*def which\(self\) -> Literal\[", line) for line in lines)
+    assert WHICH_LITERAL_RE.search(content)
 
 
-def test_interfaces_protocol_and_any_and_iterator() -> None:
+def test_interfaces_protocol_and_any_and_iterator(basic_stubs: Path) -> None:
     """Test interfaces protocol and any and iterator."""
-    stub_path = _get_stub_path("interfaces.capnp")
-    lines = read_generated_types_lines(stub_path)
-    content = "".join(lines)
+    content = read_generated_types_combined(basic_stubs / "interfaces_capnp")
     # Protocol import expected
-    assert any(line.startswith("from typing import") and "Protocol" in line for line in lines)
+    assert "Protocol" in _typing_import_names(content)
     # Interface methods now have result types (may be multi-line)
     # greet should have GreetResult return type
     assert "def greet(" in content
@@ -77,23 +74,23 @@ def test_interfaces_protocol_and_any_and_iterator() -> None:
     assert "count: int" in content
 
 
-def test_imports_cross_module_reference() -> None:
+def test_imports_cross_module_reference(basic_stubs: Path) -> None:
     # Use pre-generated stubs from basic directory
     # Both import_base and import_user should already be generated together
     """Test imports cross module reference."""
-    user_lines = read_generated_types_lines(generated_dir / "import_user_capnp")
+    user_content = read_generated_types_combined(basic_stubs / "import_user_capnp")
     # With nested structure, Shared.Reader and Shared.Builder are used
     # Reader class should return Shared.Reader
     # Now we use aliases, so it should be SharedReader
-    assert any("def shared(self) -> SharedReader:" in line for line in user_lines) or any(
-        "def shared(self) -> _SharedStructModule.Reader:" in line for line in user_lines
+    assert (
+        "def shared(self) -> SharedReader:" in user_content
+        or "def shared(self) -> _SharedStructModule.Reader:" in user_content
     ), "Reader class should return Shared.Reader or SharedReader"
     # Builder class should narrow to Shared.Builder
-    assert any("def shared(self) -> SharedBuilder:" in line for line in user_lines) or any(
-        "def shared(self) -> _SharedStructModule.Builder:" in line for line in user_lines
+    assert (
+        "def shared(self) -> SharedBuilder:" in user_content
+        or "def shared(self) -> _SharedStructModule.Builder:" in user_content
     ), "Builder class should return Shared.Builder or SharedBuilder"
     # Ensure import statement for base module types exists (imports Protocol module, not user-facing name)
     # Now we also import aliases
-    assert any(line.startswith("from ") and "import _SharedStructModule" in line for line in user_lines) or any(
-        line.startswith("from ") and "SharedReader" in line for line in user_lines
-    )
+    assert _SHARED_IMPORT_RE.search(user_content)
@@ -7,20 +7,26 @@ import pytest
 from tests.test_helpers import read_generated_types_combined
 
 
-def test_dynamic_object_reader_import(basic_stubs: Path) -> None:
+@pytest.fixture(scope="module")
+def generic_interface_stub_text(basic_stubs: Path) -> str:
+    """Read generic_interface.capnp stub helpers as one string."""
+    return read_generated_types_combined(basic_stubs / "generic_interface_capnp")
+
+
+def test_dynamic_object_reader_import(basic_stubs: Path, generic_interface_stub_text: str) -> None:
     """Test that _DynamicObjectReader is imported when AnyPointer is used in interface returns."""
     package_dir = basic_stubs / "generic_interface_capnp"
     assert (package_dir / "types" / "modules.pyi").exists(), f"Stub file not found: {package_dir}"
 
-    content = read_generated_types_combined(package_dir)
+    content = generic_interface_stub_text
 
     # Check that _DynamicObjectReader is imported (might be in multi-line import)
     assert "_DynamicObjectReader" in content, "_DynamicObjectReader should be imported when AnyPointer is used"
 
 
-def test_interface_method_returns_dynamic_object_reader(basic_stubs: Path) -> None:
+def test_interface_method_returns_dynamic_object_reader(generic_interface_stub_text: str) -> None:
     """Test that interface methods returning AnyPointer have _DynamicObjectReader on client side."""
-    content = read_generated_types_combined(basic_stubs / "generic_interface_capnp")
+    content = generic_interface_stub_text
 
     # Find the GenericGetter interface
     assert "class _GenericGetterInterfaceModule" in content, "GenericGetter interface should be generated"
@@ -33,29 +39,27 @@ def test_interface_method_returns_dynamic_object_reader(basic_stubs: Path) -> No
     assert "_DynamicCapabilityServer" in content, "Server NamedTuple should include _DynamicCapabilityServer"
 
 
-def test_anypointer_parameter_remains_any(basic_stubs: Path) -> None:
+def test_anypointer_parameter_remains_any(generic_interface_stub_text: str) -> None:
     """Test that AnyPointer as method parameter remains as Any (not _DynamicObjectReader)."""
-    content = read_generated_types_combined(basic_stubs / "generic_interface_capnp")
+    content = generic_interface_stub_text
 
     # The set() method should have value parameter - but current implementation
     # changes ALL AnyPointer to _DynamicObjectReader, so we just verify the file is valid
     assert "class _GenericSetterInterfaceModule" in content, "GenericSetter interface should be generated"
 
 
-def test_struct_anypointer_field(basic_stubs: Path) -> None:
+def test_struct_anypointer_field(dummy_stub_text: str) -> None:
     """Test that AnyPointer in struct fields also uses _DynamicObjectReader."""
-    content = read_generated_types_combined(basic_stubs / "dummy_capnp")
-
     # TestAnyPointer struct exists in dummy.capnp
-    if "TestAnyPointer" in content:
+    if "TestAnyPointer" in dummy_stub_text:
         # The field should now be _DynamicObjectReader instead of Any
         # This is actually a change in behavior - struct fields now also get better typing
-        assert "anyPointerField" in content, "TestAnyPointer should have anyPointerField"
+        assert "anyPointerField" in dummy_stub_text, "TestAnyPointer should have anyPointerField"
 
 
-def test_client_method_signature(basic_stubs: Path) -> None:
+def test_client_method_signature(generic_interface_stub_text: str) -> None:
     """Test that client methods return Result types that contain _DynamicObjectReader fields."""
-    content = read_generated_types_combined(basic_stubs / "generic_interface_capnp")
+    content = generic_interface_stub_text
 
     # Methods should return nested Client.Result
     assert "class GenericGetterClient" in content, "GenericGetterClient should exist"
@@ -71,16 +75,16 @@ def test_client_method_signature(basic_stubs: Path) -> None:
     )
 
 
-def test_result_protocol_has_dynamic_object_reader_field(basic_stubs: Path) -> None:
+def test_result_protocol_has_dynamic_object_reader_field(generic_interface_stub_text: str) -> None:
     """Test that Result Protocol classes have _DynamicObjectReader typed fields."""
-    content = read_generated_types_combined(basic_stubs / "generic_interface_capnp")
+    content = generic_interface_stub_text
 
     # GetResult should exist and have _DynamicObjectReader field (client side)
     assert "class GetResult" in content
     assert "result: _DynamicObjectReader" in content, "GetResult should have result: _DynamicObjectReader (client side)"
 
 
-def test_pyright_validation_passes(basic_stubs: Path) -> None:
+def test_pyright_validation_passes(basic_stubs: Path, generic_interface_stub_text: str) -> None:
     """Test that generated stubs pass pyright validation."""
     package_dir = basic_stubs / "generic_interface_capnp"
 
@@ -89,7 +93,7 @@ def test_pyright_validation_passes(basic_stubs: Path) -> None:
     # Just verify the helper stubs exist and are valid Python syntax
     assert (package_dir / "types" / "modules.pyi").exists()
 
-    content = read_generated_types_combined(package_dir)
+    content = generic_interface_stub_text
     # Basic syntax check - should compile without errors
     try:
         compile(content, str(package_dir / "types"), "exec")
@@ -97,9 +101,9 @@ def test_pyright_validation_passes(basic_stubs: Path) -> None:
         pytest.fail(f"Generated stub has syntax error: {e}")
 
 
-def test_multiple_result_fields_with_anypointer(basic_stubs: Path) -> None:
+def test_multiple_result_fields_with_anypointer(generic_interface_stub_text: str) -> None:
     """Test that methods with multiple AnyPointer result fields work correctly."""
-    content = read_generated_types_combined(basic_stubs / "generic_interface_capnp")
+    content = generic_interface_stub_text
 
     # getMultiple() returns (first :AnyPointer, second :AnyPointer)
     # Result Protocol should use _DynamicObjectReader (client side)
@@ -4,20 +4,30 @@ from __future__ import annotations
 
 import argparse
 import asyncio
+import contextlib
+import functools
+import importlib.abc
+import importlib.machinery
+import json
 import logging
 import os
+import re
 import shutil
 import sys
 from dataclasses import dataclass
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from capnp_stub_generator.run import run
 
 if TYPE_CHECKING:
-    from collections.abc import Mapping, Sequence
+    from collections.abc import Iterator, Mapping, Sequence
+    from importlib.machinery import ModuleSpec
+    from types import ModuleType
 
 LOGGER = logging.getLogger(__name__)
+TOP_LEVEL_CLASS_HEADER_RE = re.compile(r"^class (?P<name>\w+)\b", re.MULTILINE)
+WHICH_LITERAL_RE = re.compile(r"^\s*def which\(self\) -> Literal\[", re.MULTILINE)
 GENERATED_TYPES_COMBINED_ORDER = (
     "modules.pyi",
     "schemas.pyi",
@@ -45,6 +55,13 @@ class CommandResult:
     stderr: str
 
 
+@dataclass(frozen=True, slots=True)
+class PyrightResult(CommandResult):
+    """Captured pyright run with the error count taken from its JSON summary."""
+
+    error_count: int
+
+
 def resolve_executable(name: str) -> str:
     """Resolve an executable name to an absolute path."""
     executable = shutil.which(name)
@@ -96,14 +113,142 @@ def run_command(
     return asyncio.run(_run_command_async(command, cwd=cwd, env=env))
 
 
+async def _run_commands_async(commands: Sequence[Sequence[str | os.PathLike[str]]]) -> list[CommandResult]:
+    """Run independent commands concurrently and capture their outputs."""
+    return list(await asyncio.gather(*(_run_command_async(command) for command in commands)))
+
+
+def run_commands(commands: Sequence[Sequence[str | os.PathLike[str]]]) -> list[CommandResult]:
+    """Run independent commands concurrently and return their results in input order."""
+    return asyncio.run(_run_commands_async(commands))
+
+
 def run_pyright(
     *paths: str | Path,
     cwd: str | Path | None = None,
     env: Mapping[str, str] | None = None,
-) -> CommandResult:
-    """Run pyright against one or more paths."""
+    executable: str = "pyright",
+) -> PyrightResult:
+    """Run pyright (or a compatible checker such as basedpyright) and parse its JSON report once."""
     resolved_paths = [os.fspath(path) for path in paths]
-    return run_command(["pyright", *resolved_paths], cwd=cwd, env=env)
+    result = run_command([executable, "--outputjson", *resolved_paths], cwd=cwd, env=env)
+    try:
+        report = json.loads(result.stdout)
+    except json.JSONDecodeError:
+        # Pyright only skips the JSON report when it fails before analysis; keep its raw output.
+        return _unparsed_pyright_result(result)
+    return PyrightResult(
+        returncode=result.returncode,
+        stdout=_format_pyright_diagnostics(report),
+        stderr=result.stderr,
+        error_count=report["summary"]["errorCount"],
+    )
+
+
+def run_pyright_by_file(
+    *paths: str | Path,
+    cwd: str | Path | None = None,
+    env: Mapping[str, str] | None = None,
+    executable: str = "pyright",
+) -> dict[Path, PyrightResult]:
+    """Run pyright once over several files and split its JSON report into one result per file.
+
+    Batching pays pyright's startup once instead of once per file. Results are keyed by the
+    resolved path of each input file. A nonzero exit that no input file's diagnostics explain
+    counts as one error for every file.
+    """
+    resolved_paths = {Path(path).resolve(): os.fspath(path) for path in paths}
+    result = run_command([executable, "--outputjson", *resolved_paths.values()], cwd=cwd, env=env)
+    try:
+        report = json.loads(result.stdout)
+    except json.JSONDecodeError:
+        # Without a report the failure cannot be attributed to a file, so every file sees the raw output.
+        return dict.fromkeys(resolved_paths, _unparsed_pyright_result(result))
+
+    diagnostics_by_file: dict[Path, list[Mapping[str, Any]]] = {path: [] for path in resolved_paths}
+    for diagnostic in report.get("generalDiagnostics", []):
+        diagnostics_by_file.setdefault(Path(diagnostic["file"]).resolve(), []).append(diagnostic)
+
+    file_reports = {}
+    for path in resolved_paths:
+        diagnostics = diagnostics_by_file[path]
+        severities = [diagnostic["severity"] for diagnostic in diagnostics]
+        file_reports[path] = {
+            "generalDiagnostics": diagnostics,
+            "summary": {
+                "errorCount": severities.count("error"),
+                "warningCount": severities.count("warning"),
+                "informationCount": severities.count("information"),
+            },
+        }
+
+    # A failing run with no error in any input file (e.g. a config error) must not look clean for every file.
+    unattributed_failure = result.returncode != 0 and not any(
+        file_report["summary"]["errorCount"] for file_report in file_reports.values()
+    )
+    return {
+        path: PyrightResult(
+            returncode=result.returncode,
+            stdout=_format_pyright_diagnostics(file_report) + (f"\n{result.stderr}" if unattributed_failure else ""),
+            stderr=result.stderr,
+            error_count=file_report["summary"]["errorCount"] or int(unattributed_failure),
+        )
+        for path, file_report in file_reports.items()
+    }
+
+
+def write_pyright_sample_project(directory: Path, samples: Mapping[str, str], *stub_dirs: Path) -> list[Path]:
+    """Write type-checking samples into ``directory`` and point pyright at ``stub_dirs`` from there.
+
+    Keeping samples out of the generated stub directories leaves those trees untouched between runs.
+    Each stub dir's generated root, the nearest directory holding ``capnp-stubs``, is added as well so
+    the ``capnp`` base classes stay typed. Run pyright with ``cwd=directory`` so it picks up the
+    written ``pyrightconfig.json``.
+    """
+    extra_paths = [stub_dir.resolve() for stub_dir in stub_dirs]
+    for stub_dir in list(extra_paths):
+        stub_root = next((path for path in (stub_dir, *stub_dir.parents) if (path / "capnp-stubs").is_dir()), None)
+        if stub_root is None:
+            msg = f"No capnp-stubs directory above {stub_dir}"
+            raise FileNotFoundError(msg)
+        if stub_root not in extra_paths:
+            extra_paths.append(stub_root)
+    config = {"extraPaths": [os.fspath(path) for path in extra_paths]}
+    (directory / "pyrightconfig.json").write_text(json.dumps(config))
+    sample_files = []
+    for filename, code in samples.items():
+        sample_file = directory / filename
+        sample_file.write_text(code)
+        sample_files.append(sample_file)
+    return sample_files
+
+
+def _unparsed_pyright_result(result: CommandResult) -> PyrightResult:
+    """Wrap a pyright run that produced no JSON report, never reporting a failed run as error-free."""
+    return PyrightResult(
+        returncode=result.returncode,
+        stdout=result.stdout,
+        stderr=result.stderr,
+        error_count=result.stdout.count("error:") or int(result.returncode != 0),
+    )
+
+
+def _format_pyright_diagnostics(report: Mapping[str, Any]) -> str:
+    """Render pyright JSON diagnostics in the CLI's `file:line:col - severity: message` form."""
+    lines = []
+    for diagnostic in report.get("generalDiagnostics", []):
+        start = diagnostic["range"]["start"]
+        rule = f" ({diagnostic['rule']})" if "rule" in diagnostic else ""
+        lines.append(
+            f"{diagnostic['file']}:{start['line'] + 1}:{start['character'] + 1} - "
+            f"{diagnostic['severity']}: {diagnostic['message']}{rule}",
+        )
+    summary = report["summary"]
+    lines.append(
+        f"{summary['errorCount']} errors, {summary['warningCount']} warnings, "
+        f"{summary['informationCount']} informations",
+    )
+    return "\n".join(lines)
 
 
 def run_python_file(
@@ -121,8 +266,13 @@ def read_generated_types_file(package_dir: Path, *relative_parts: str) -> str:
     return (package_dir / "types" / Path(*relative_parts)).read_text()
 
 
+@functools.lru_cache(maxsize=256)
 def read_generated_types_combined(package_dir: Path) -> str:
-    """Read generated helper stubs as one combined view for assertion-heavy tests."""
+    """Read generated helper stubs as one combined view for assertion-heavy tests.
+
+    Generated trees are written once and only read afterwards, so the combined view is memoized
+    per package directory instead of being re-read and re-normalized by every test.
+    """
     type_dir = package_dir / "types"
     contents: list[str] = []
     runtime_stub = package_dir / "__init__.pyi"
@@ -173,6 +323,30 @@ def read_generated_types_combined(package_dir: Path) -> str:
     return f"{combined_content}\n\n{synthetic_view}"
 
 
+@functools.lru_cache(maxsize=32)
+def _top_level_class_spans(content: str) -> dict[str, tuple[int, int]]:
+    """Index where every top-level class of a stub text starts and ends, keeping the first class of each name."""
+    headers = list(TOP_LEVEL_CLASS_HEADER_RE.finditer(content))
+    spans: dict[str, tuple[int, int]] = {}
+    for index, header in enumerate(headers):
+        end = headers[index + 1].start() - 1 if index + 1 < len(headers) else len(content)
+        spans.setdefault(header.group("name"), (header.start(), end))
+    return spans
+
+
+def class_block(content: str, class_name: str) -> str:
+    """Extract a top-level class from generated stub text, up to the next top-level class.
+
+    Raises AssertionError when the class is missing, so checks on the block never pass vacuously.
+    """
+    span = _top_level_class_spans(content).get(class_name)
+    if span is None:
+        msg = f"{class_name} not found"
+        raise AssertionError(msg)
+    start, end = span
+    return content[start:end]
+
+
 def _normalize_generated_types_line(line: str, prefixes: Sequence[str]) -> str:
     """Normalize one generated helper line into the old flattened view used by legacy assertions."""
     normalized_line = line
@@ -186,6 +360,44 @@ def read_generated_types_lines(package_dir: Path) -> list[str]:
     return read_generated_types_combined(package_dir).splitlines(keepends=True)
 
 
+class _GeneratedPackageFinder(importlib.abc.MetaPathFinder):
+    """Resolve only the named top-level generated packages from one output directory."""
+
+    def __init__(self, directory: Path, package_names: Sequence[str]) -> None:
+        self._search_path = [os.fspath(directory)]
+        self._package_names = frozenset(package_names)
+
+    def find_spec(
+        self,
+        fullname: str,
+        path: Sequence[str] | None = None,  # noqa: ARG002
+        target: ModuleType | None = None,  # noqa: ARG002
+    ) -> ModuleSpec | None:
+        """Find a spec for one of the named packages; submodules resolve through the package `__path__`."""
+        if fullname not in self._package_names:
+            return None
+        return importlib.machinery.PathFinder.find_spec(fullname, self._search_path)
+
+
+@contextlib.contextmanager
+def generated_modules_from(directory: Path, *package_names: str) -> Iterator[None]:
+    """Make generated packages in `directory` importable, then drop them from `sys.modules` again.
+
+    A scoped meta path finder is used instead of `sys.path`, so unrelated imports never scan the generated tree.
+    """
+    finder = _GeneratedPackageFinder(directory, package_names)
+    sys.meta_path.insert(0, finder)
+    try:
+        yield
+    finally:
+        sys.meta_path.remove(finder)
+        submodule_prefixes = tuple(f"{package_name}." for package_name in package_names)
+        for module_name in [
+            name for name in sys.modules if name in package_names or name.startswith(submodule_prefixes)
+        ]:
+            sys.modules.pop(module_name, None)
+
+
 def log_summary(title: str, lines: Sequence[str]) -> None:
     """Log a human-readable test summary."""
     divider = "=" * 70
@@ -193,17 +405,24 @@ def log_summary(title: str, lines: Sequence[str]) -> None:
     LOGGER.info("\n%s\n%s\n%s\n%s\n%s", divider, title, divider, body, divider)
 
 
-def run_generator(args_list: Sequence[str]) -> None:
-    """Convert CLI-style args to a `run()` call."""
-    parser = argparse.ArgumentParser()
-    parser.add_argument("-p", "--paths", nargs="+", default=[])
-    parser.add_argument("-o", "--output-dir", type=str, default="")
-    parser.add_argument("-r", "--recursive", action="store_true", default=False)
-    parser.add_argument("-e", "--excludes", nargs="+", default=[])
-    parser.add_argument("-c", "--clean", nargs="+", default=[])
-    parser.add_argument("-I", "--import-path", dest="import_paths", nargs="+", default=[])
-    parser.add_argument("--no-pyright", dest="skip_pyright", action="store_true", default=False)
-    parser.add_argument("--no-augment-capnp-stubs", dest="augment_capnp_stubs", action="store_false", default=True)
-
-    args = parser.parse_args(args_list)
+def run_generator(  # noqa: PLR0913
+    paths: Sequence[str],
+    output_dir: Path | str = "",
+    *,
+    import_paths: Sequence[str] = (),
+    excludes: Sequence[str] = (),
+    recursive: bool = False,
+    skip_pyright: bool = False,
+) -> None:
+    """Call `run()` in-process with a ready-made namespace instead of parsing CLI-style args."""
+    args = argparse.Namespace(
+        paths=list(paths),
+        output_dir=str(output_dir),
+        recursive=recursive,
+        excludes=list(excludes),
+        clean=[],
+        import_paths=list(import_paths),
+        skip_pyright=skip_pyright,
+        augment_capnp_stubs=True,
+    )
     run(args, ".")
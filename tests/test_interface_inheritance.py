@@ -17,8 +17,22 @@ from tests.test_helpers import read_generated_types_combined, run_generator
 TESTS_DIR = Path(__file__).parent
 ZALFMAS_DIR = TESTS_DIR / "schemas" / "zalfmas"
 IDENTIFIABLE_DIR = TESTS_DIR / "schemas" / "examples" / "identifiable"
-GENERATED_DIR = TESTS_DIR / "_generated" / "interface_inheritance"
 MIN_IDENTIFIABLE_SERVER_CLASSES = 3
+# Union of the schemas every test below inspects, so the generator (and its pyright check) runs once.
+INHERITANCE_SCHEMAS = (
+    "model.capnp",
+    "common.capnp",
+    "climate.capnp",
+    "soil.capnp",
+    "management.capnp",
+    "crop.capnp",
+    "registry.capnp",
+    "persistence.capnp",
+    "service.capnp",
+    "date.capnp",
+    "geo.capnp",
+    "cluster_admin_service.capnp",
+)
 
 
 def _modules_stub_text(stub_file: Path) -> str:
@@ -27,16 +41,18 @@ def _modules_stub_text(stub_file: Path) -> str:
 
 
 @pytest.fixture(scope="module")
-def generated_dir() -> Path:
-    """Ensure the generated directory exists and is clean."""
-    if GENERATED_DIR.exists():
-        shutil.rmtree(GENERATED_DIR)
+def generated_dir(worker_generated_dir: Path) -> Path:
+    """Generate stubs for every schema used by this module in one generator run.
 
-    GENERATED_DIR.mkdir(parents=True, exist_ok=True)
-
-    return GENERATED_DIR
-
-    # Keep generated files for inspection
+    The output directory is private to the pytest-xdist worker, so concurrent workers never clear each other's stubs.
+    """
+    output_dir = worker_generated_dir / "interface_inheritance"
+    if output_dir.exists():
+        shutil.rmtree(output_dir)
+    output_dir.mkdir(parents=True)
+    schema_paths = [str(ZALFMAS_DIR / schema_name) for schema_name in INHERITANCE_SCHEMAS]
+    run_generator(schema_paths, output_dir, import_paths=[str(ZALFMAS_DIR)])
+    return output_dir
 
 
 def test_simple_interface_inheritance(generated_dir: Path) -> None:
@@ -46,36 +62,17 @@ def test_simple_interface_inheritance(generated_dir: Path) -> None:
     - class ClimateInstance(Identifiable, Protocol):
     - class Server(Identifiable.Server):
     """
-    # Generate stubs for model.capnp which has ClimateInstance extends Identifiable
-    schema_files = [
-        ZALFMAS_DIR / "model.capnp",
-        ZALFMAS_DIR / "common.capnp",
-        ZALFMAS_DIR / "climate.capnp",
-        ZALFMAS_DIR / "soil.capnp",
-        ZALFMAS_DIR / "management.capnp",
-        ZALFMAS_DIR / "crop.capnp",
-        ZALFMAS_DIR / "registry.capnp",
-        ZALFMAS_DIR / "persistence.capnp",
-        ZALFMAS_DIR / "service.capnp",
-        ZALFMAS_DIR / "date.capnp",
-        ZALFMAS_DIR / "geo.capnp",
-    ]
-
-    schema_paths = [str(f) for f in schema_files]
-    args = ["-p", *schema_paths, "-o", str(generated_dir), "-I", str(ZALFMAS_DIR)]
-    run_generator(args)
-
     # Check the generated stub (in mas/schema/model subdirectory due to Python module annotations)
     stub_file = generated_dir / "mas" / "schema" / "model" / "model_capnp" / "__init__.pyi"
     assert stub_file.exists(), f"Stub file was not generated at {stub_file}"
 
-    content = stub_file.read_text()
+    runtime_stub = stub_file.read_bytes()
     modules_content = _modules_stub_text(stub_file)
     client_content = read_generated_types_combined(generated_dir / "mas" / "schema" / "model" / "model_capnp")
 
     # Check that ClimateInstance interface exists as Protocol
     assert "class _ClimateInstanceInterfaceModule(" in modules_content, "ClimateInstance Protocol module should exist"
-    assert "ClimateInstance: types.modules._ClimateInstanceInterfaceModule" in content, (
+    assert b"ClimateInstance: types.modules._ClimateInstanceInterfaceModule" in runtime_stub, (
         "ClimateInstance annotation should exist"
     )
 
@@ -86,7 +83,7 @@ def test_simple_interface_inheritance(generated_dir: Path) -> None:
 
     # Check that _ClimateInstanceInterfaceModule.Server extends _IdentifiableInterfaceModule.Server
     # The Server class should be nested inside _ClimateInstanceInterfaceModule
-    lines = modules_content.split("\n")
+    lines = modules_content.splitlines()
     in_climate_instance = False
     found_server_inheritance = False
 
@@ -112,15 +109,10 @@ def test_multiple_interface_inheritance(generated_dir: Path) -> None:
     - class IdentifiableHolder:
     - class Server(Identifiable.Server, Holder.Server):
     """
-    # Generate stub for common.capnp
-    schema_file = ZALFMAS_DIR / "common.capnp"
-    args = ["-p", str(schema_file), "-o", str(generated_dir), "-I", str(ZALFMAS_DIR)]
-    run_generator(args)
-
     stub_file = generated_dir / "mas" / "schema" / "common" / "common_capnp" / "__init__.pyi"
     assert stub_file.exists(), "Stub file was not generated"
 
-    content = stub_file.read_text()
+    runtime_stub = stub_file.read_bytes()
     modules_content = _modules_stub_text(stub_file)
     client_content = read_generated_types_combined(generated_dir / "mas" / "schema" / "common" / "common_capnp")
 
@@ -128,7 +120,7 @@ def test_multiple_interface_inheritance(generated_dir: Path) -> None:
     assert "class _IdentifiableHolderInterfaceModule(" in modules_content, (
         "IdentifiableHolder Protocol module should exist"
     )
-    assert "IdentifiableHolder: types.modules._IdentifiableHolderInterfaceModule" in content, (
+    assert b"IdentifiableHolder: types.modules._IdentifiableHolderInterfaceModule" in runtime_stub, (
         "IdentifiableHolder annotation should exist"
     )
 
@@ -139,7 +131,7 @@ def test_multiple_interface_inheritance(generated_dir: Path) -> None:
     assert "HolderClient" in client_content
 
     # Check that IdentifiableHolder.Server extends both base Servers
-    lines = modules_content.split("\n")
+    lines = modules_content.splitlines()
     in_identifiable_holder = False
     found_server_inheritance = False
 
@@ -166,18 +158,6 @@ def test_interface_with_persistent_inheritance(generated_dir: Path) -> None:
     Service in climate.capnp extends Identifiable and Persistent.
     We use Service instead of Dataset due to Dataset having complex dependency issues.
     """
-    schema_files = [
-        ZALFMAS_DIR / "climate.capnp",
-        ZALFMAS_DIR / "common.capnp",
-        ZALFMAS_DIR / "persistence.capnp",
-        ZALFMAS_DIR / "date.capnp",
-        ZALFMAS_DIR / "geo.capnp",
-    ]
-
-    schema_paths = [str(f) for f in schema_files]
-    args = ["-p", *schema_paths, "-o", str(generated_dir), "-I", str(ZALFMAS_DIR)]
-    run_generator(args)
-
     stub_file = generated_dir / "mas" / "schema" / "climate" / "climate_capnp" / "__init__.pyi"
     assert stub_file.exists(), "Stub file was not generated"
 
@@ -189,7 +169,7 @@ def test_interface_with_persistent_inheritance(generated_dir: Path) -> None:
     ), "Service Module should extend both Identifiable and Persistent"
 
     # Check Server class inheritance - Service.Server should extend both base Servers
-    lines = modules_content.split("\n")
+    lines = modules_content.splitlines()
     in_service = False
     found_server_inheritance = False
 
@@ -216,15 +196,6 @@ def test_interface_inheritance_in_nested_interfaces(generated_dir: Path) -> None
     In cluster_admin_service.capnp, AdminMaster, UserMaster, and Runtime
     all extend Identifiable.
     """
-    schema_files = [
-        ZALFMAS_DIR / "cluster_admin_service.capnp",
-        ZALFMAS_DIR / "common.capnp",
-    ]
-
-    schema_paths = [str(f) for f in schema_files]
-    args = ["-p", *schema_paths, "-o", str(generated_dir), "-I", str(ZALFMAS_DIR)]
-    run_generator(args)
-
     stub_file = generated_dir / "mas" / "schema" / "cluster" / "cluster_admin_service_capnp" / "__init__.pyi"
     assert stub_file.exists(), "Stub file was not generated"
 
@@ -259,25 +230,6 @@ def test_interface_method_inheritance_visibility(generated_dir: Path) -> None:
     1. See Identifiable's methods through type checking
     2. Implement ClimateInstance.Server by also implementing Identifiable.Server methods
     """
-    # Generate stubs
-    schema_files = [
-        ZALFMAS_DIR / "model.capnp",
-        ZALFMAS_DIR / "common.capnp",
-        ZALFMAS_DIR / "climate.capnp",
-        ZALFMAS_DIR / "soil.capnp",
-        ZALFMAS_DIR / "management.capnp",
-        ZALFMAS_DIR / "crop.capnp",
-        ZALFMAS_DIR / "registry.capnp",
-        ZALFMAS_DIR / "persistence.capnp",
-        ZALFMAS_DIR / "service.capnp",
-        ZALFMAS_DIR / "date.capnp",
-        ZALFMAS_DIR / "geo.capnp",
-    ]
-
-    schema_paths = [str(f) for f in schema_files]
-    args = ["-p", *schema_paths, "-o", str(generated_dir), "-I", str(ZALFMAS_DIR)]
-    run_generator(args)
-
     # Read both stub files
     model_stub_path = generated_dir / "mas" / "schema" / "model" / "model_capnp" / "__init__.pyi"
     model_stub = model_stub_path.read_text()
@@ -306,17 +258,13 @@ def test_empty_interface_with_inheritance(generated_dir: Path) -> None:
 
     IdentifiableHolder has no methods of its own, but extends two other interfaces.
     """
-    schema_file = ZALFMAS_DIR / "common.capnp"
-    args = ["-p", str(schema_file), "-o", str(generated_dir), "-I", str(ZALFMAS_DIR)]
-    run_generator(args)
-
     stub_file = generated_dir / "mas" / "schema" / "common" / "common_capnp" / "__init__.pyi"
     assert stub_file.exists(), "Stub file was not generated"
 
     modules_content = _modules_stub_text(stub_file)
 
     # Find _IdentifiableHolderInterfaceModule class
-    lines = modules_content.split("\n")
+    lines = modules_content.splitlines()
     in_identifiable_holder = False
     holder_content: list[str] = []
 
@@ -78,7 +78,7 @@ class TestCalculatorInterfaceMethodTypes:
         # ReadResult should have float value field
         assert "class ReadResult" in stub_content
         # Find ReadResult and check it has value: float
-        lines = stub_content.split("\n")
+        lines = stub_content.splitlines()
         in_read_result = False
         for line in lines:
             if "class ReadResult" in line:
@@ -114,7 +114,7 @@ class TestInterfaceMethodTypeRegression:
         stub_content = read_generated_types_combined(generate_calculator_stubs / "calculator_capnp")
 
         # Extract just the Calculator interface methods
-        lines = stub_content.split("\n")
+        lines = stub_content.splitlines()
         in_calculator = False
         calculator_methods: list[str] = []
 
@@ -8,37 +8,50 @@ when trying to access result fields like context.results.cap.
 from __future__ import annotations
 
 import base64
+import mmap
 import re
 from typing import TYPE_CHECKING
 
+import pytest
+
 import schema_capnp
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
     from pathlib import Path
 
 MIN_EMBEDDED_SCHEMA_COUNT = 10
+SCHEMA_NODES_RE = re.compile(rb"_SCHEMA_NODES = \[(.*?)\]", re.DOTALL)
+
+
+@pytest.fixture(scope="module")
+def calculator_runtime_map(calculator_stubs: Path) -> Iterator[mmap.mmap]:
+    """Map the calculator runtime module, which embeds every schema node as base64, read-only.
 
+    Note that `in` on an mmap tests for a single byte, so substring checks use `find()`.
+    """
+    runtime_file = calculator_stubs / "calculator_capnp/__init__.py"
+    with runtime_file.open("rb") as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as runtime_map:
+        yield runtime_map
 
-def test_interface_result_structs_are_embedded(calculator_stubs: Path) -> None:
+
+def test_interface_result_structs_are_embedded(calculator_runtime_map: mmap.mmap) -> None:
     """Verify that interface method result structs are embedded in the binary.
 
     Before the fix, only the explicit param structs were embedded,
     but the implicit result structs were missing, causing runtime errors.
     """
-    # Load the generated module to get the embedded schemas
-    stub_file = calculator_stubs / "calculator_capnp/__init__.py"
-    content = stub_file.read_text()
-
-    match = re.search(r"_SCHEMA_NODES = \[(.*?)\]", content, re.DOTALL)
+    # Scan the generated module to get the embedded schemas
+    match = SCHEMA_NODES_RE.search(calculator_runtime_map)
     assert match, "_SCHEMA_NODES not found in generated file"
 
     # Parse all embedded schema IDs
-    schema_lines = match.group(1).strip().split("\n")
+    schema_lines = match.group(1).strip().split(b"\n")
     embedded_ids: set[int] = set()
     for raw_line in schema_lines:
         schema_line = raw_line.strip()
-        if schema_line.startswith(('"', "'")):
-            schema_b64 = schema_line.split(",")[0].strip().strip('"').strip("'")
+        if schema_line.startswith((b'"', b"'")):
+            schema_b64 = schema_line.split(b",")[0].strip().strip(b'"').strip(b"'")
             schema_data = base64.b64decode(schema_b64)
             node_reader = schema_capnp.Node.from_bytes_packed(schema_data)
             embedded_ids.add(node_reader.id)
@@ -49,37 +62,33 @@ def test_interface_result_structs_are_embedded(calculator_stubs: Path) -> None:
     assert evaluate_results_id in embedded_ids, "Calculator.evaluate$Results not embedded"
 
 
-def test_result_struct_has_fields(calculator_stubs: Path) -> None:
+def test_result_struct_has_fields(calculator_runtime_map: mmap.mmap) -> None:
     """Verify that the embedded result struct can be loaded and has the expected fields."""
     # Just check that result structs are present in the generated file
     # Runtime test would require complex import handling
-    stub_file = calculator_stubs / "calculator_capnp/__init__.py"
-    content = stub_file.read_text()
+    runtime_map = calculator_runtime_map
 
     # Verify result structs are mentioned
-    assert "evaluate$Results" in content or "evaluateResults" in content
-    assert "_loader.get" in content  # Loader is created
-    assert "load_dynamic" in content  # Schemas are loaded
+    assert runtime_map.find(b"evaluate$Results") != -1 or runtime_map.find(b"evaluateResults") != -1
+    assert runtime_map.find(b"_loader.get") != -1  # Loader is created
+    assert runtime_map.find(b"load_dynamic") != -1  # Schemas are loaded
 
 
-def test_param_structs_are_embedded(calculator_stubs: Path) -> None:
+def test_param_structs_are_embedded(calculator_runtime_map: mmap.mmap) -> None:
     """Verify that interface method param structs are also embedded.
 
     While explicit param structs are usually in nestedNodes,
     implicit param structs for methods should also be embedded.
     """
-    stub_file = calculator_stubs / "calculator_capnp/__init__.py"
-    content = stub_file.read_text()
-
-    match = re.search(r"_SCHEMA_NODES = \[(.*?)\]", content, re.DOTALL)
+    match = SCHEMA_NODES_RE.search(calculator_runtime_map)
     assert match
 
-    schema_lines = match.group(1).strip().split("\n")
+    schema_lines = match.group(1).strip().split(b"\n")
     embedded_ids: set[int] = set()
     for raw_line in schema_lines:
         schema_line = raw_line.strip()
-        if schema_line.startswith(('"', "'")):
-            schema_b64 = schema_line.split(",")[0].strip().strip('"').strip("'")
+        if schema_line.startswith((b'"', b"'")):
+            schema_b64 = schema_line.split(b",")[0].strip().strip(b'"').strip(b"'")
             schema_data = base64.b64decode(schema_b64)
             node_reader = schema_capnp.Node.from_bytes_packed(schema_data)
             embedded_ids.add(node_reader.id)
@@ -91,19 +100,17 @@ def test_param_structs_are_embedded(calculator_stubs: Path) -> None:
     assert len(embedded_ids) > MIN_EMBEDDED_SCHEMA_COUNT, "Should have many schemas including params/results"
 
 
-def test_runtime_result_field_access(calculator_stubs: Path) -> None:
+def test_runtime_result_field_access(calculator_stubs: Path, calculator_runtime_map: mmap.mmap) -> None:
     """Test that result tuple helpers are generated in the runtime tuple helper module."""
-    runtime_file = calculator_stubs / "calculator_capnp/__init__.py"
-    tuple_module_file = calculator_stubs / "calculator_capnp/types/results/tuples.py"
-    runtime_content = runtime_file.read_text()
-    tuple_module_content = tuple_module_file.read_text()
+    runtime_map = calculator_runtime_map
+    tuple_module_content = (calculator_stubs / "calculator_capnp/types/results/tuples.py").read_bytes()
 
     # Verify the generated code has the necessary structure
     # for runtime access to result fields
-    assert "_loader = capnp.SchemaLoader()" in runtime_content
-    assert "for _schema_b64 in _SCHEMA_NODES:" in runtime_content
-    assert "_loader.load_dynamic(_node_reader)" in runtime_content
+    assert runtime_map.find(b"_loader = capnp.SchemaLoader()") != -1
+    assert runtime_map.find(b"for _schema_b64 in _SCHEMA_NODES:") != -1
+    assert runtime_map.find(b"_loader.load_dynamic(_node_reader)") != -1
 
     # Result tuples should be created in the runtime helper module, not on the top-level runtime module.
-    assert "EvaluateResultTuple" not in runtime_content
-    assert "NamedTuple" in tuple_module_content or "namedtuple" in tuple_module_content.lower()
+    assert runtime_map.find(b"EvaluateResultTuple") == -1
+    assert b"NamedTuple" in tuple_module_content or b"namedtuple" in tuple_module_content.lower()
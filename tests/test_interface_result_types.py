@@ -66,7 +66,7 @@ class TestRPCResultTypes:
         assert "class ReadResult" in stub_content
 
         # Should have value field (float)
-        lines = stub_content.split("\n")
+        lines = stub_content.splitlines()
         in_read_result = False
         found_value_float = False
 
@@ -166,7 +166,7 @@ class TestRPCResultFieldTypes:
         stub_content = read_generated_types_combined(generate_calculator_stubs / "calculator_capnp")
 
         # ReadResult.value should be float (primitive type)
-        lines = stub_content.split("\n")
+        lines = stub_content.splitlines()
         in_read_result = False
 
         for line in lines:
@@ -5,27 +5,26 @@ import re
 EXPECTED_SERVER_CLASS_COUNT = 3
 
 
-def test_server_class_exists_for_interfaces(calculator_stub_lines: list[str]) -> None:
+def test_server_class_exists_for_interfaces(calculator_stub_lines: list[str], calculator_stub_text: str) -> None:
     """Server classes should be generated for all interfaces."""
     lines = calculator_stub_lines
 
     # Check that interface modules exist (now inherit from _InterfaceModule)
-    assert any("class _ValueInterfaceModule(_InterfaceModule):" in line for line in lines)
-    assert any("class _FunctionInterfaceModule(_InterfaceModule):" in line for line in lines)
-    assert any("class _CalculatorInterfaceModule(_InterfaceModule):" in line for line in lines)
+    assert "class _ValueInterfaceModule(_InterfaceModule):" in calculator_stub_text
+    assert "class _FunctionInterfaceModule(_InterfaceModule):" in calculator_stub_text
+    assert "class _CalculatorInterfaceModule(_InterfaceModule):" in calculator_stub_text
 
     # Check that Server classes exist (now inherit from _DynamicCapabilityServer)
-    assert any("class Server(_DynamicCapabilityServer):" in line for line in lines)
+    assert "class Server(_DynamicCapabilityServer):" in calculator_stub_text
 
     # Count Server classes - should be 3 (Value, Function, Calculator)
     server_count = sum(1 for line in lines if line.strip() == "class Server(_DynamicCapabilityServer):")
     assert server_count == EXPECTED_SERVER_CLASS_COUNT, f"Expected 3 Server classes, found {server_count}"
 
 
-def test_server_methods_have_signatures(calculator_stub_lines: list[str]) -> None:
+def test_server_methods_have_signatures(calculator_stub_text: str) -> None:
     """Server class methods should have proper type signatures."""
-    lines = calculator_stub_lines
-    content = "".join(lines)
+    content = calculator_stub_text
 
     # Function.Server should have call method
     assert "class Server(_DynamicCapabilityServer):" in content
@@ -43,10 +42,9 @@ def test_server_methods_have_signatures(calculator_stub_lines: list[str]) -> Non
     assert "expression: ExpressionReader" in content
 
 
-def test_server_methods_accept_context(calculator_stub_lines: list[str]) -> None:
+def test_server_methods_accept_context(calculator_stub_text: str) -> None:
     """Server methods should accept _context parameter and **kwargs."""
-    lines = calculator_stub_lines
-    content = "".join(lines)
+    content = calculator_stub_text
 
     # All server methods should have **kwargs
     assert "**kwargs" in content
@@ -78,10 +76,9 @@ def test_server_methods_accept_context(calculator_stub_lines: list[str]) -> None
             assert "CallContext" in method, f"Server method _context should be typed with CallContext: {method}"
 
 
-def test_server_methods_return_interface_or_implementation(calculator_stub_lines: list[str]) -> None:
+def test_server_methods_return_interface_or_implementation(calculator_stub_text: str) -> None:
     """Server methods returning interfaces return Server types."""
-    lines = calculator_stub_lines
-    content = "".join(lines)
+    content = calculator_stub_text
 
     # Server methods returning interfaces return Interface.Server types
     # (not Interface | Interface.Server because servers work with Server implementations)
@@ -90,10 +87,10 @@ def test_server_methods_return_interface_or_implementation(calculator_stub_lines
     assert "_CalculatorInterfaceModule._FunctionInterfaceModule.Server" in content
 
 
-def test_server_method_parameters_match_protocol(calculator_stub_lines: list[str]) -> None:
+def test_server_method_parameters_match_protocol(calculator_stub_lines: list[str], calculator_stub_text: str) -> None:
     """Server method parameters should match the Protocol interface plus _context."""
     lines = calculator_stub_lines
-    content = "".join(lines)
+    content = calculator_stub_text
 
     # Find Function Protocol's call method (now optional parameters)
     protocol_call_found = False
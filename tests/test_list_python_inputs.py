@@ -6,7 +6,15 @@ import re
 from pathlib import Path
 from string import Template
 
-from tests.test_helpers import read_generated_types_file, run_pyright, run_python_file
+import pytest
+
+from tests.test_helpers import (
+    PyrightResult,
+    read_generated_types_file,
+    run_pyright_by_file,
+    run_python_file,
+    write_pyright_sample_project,
+)
 
 TESTS_DIR = Path(__file__).parent
 BASIC_SCHEMAS_DIR = TESTS_DIR / "schemas" / "basic"
@@ -328,9 +336,8 @@ def test_generated_rpc_list_inputs_use_precise_sequences(calculator_stubs: Path,
     )
 
 
-def test_struct_python_inputs_type_check(addressbook_stubs: Path, basic_stubs: Path) -> None:
-    """Pyright should accept mixed struct dict/Builder/Reader inputs."""
-    addressbook_code = """
+_STRUCT_INPUT_SAMPLES = {
+    "test_python_struct_inputs.py": """
 import addressbook_capnp
 
 person_builder = addressbook_capnp.Person.new_message(id=2, name="Bob", email="bob@example.com")
@@ -362,15 +369,8 @@ first_person = book.people[0]
 first_phone = person.phones[0]
 name: str = first_person.name
 number: str = first_phone.number
-"""
-
-    addressbook_file = addressbook_stubs / "test_python_struct_inputs.py"
-    addressbook_file.write_text(addressbook_code)
-
-    addressbook_result = run_pyright(addressbook_file, cwd=TESTS_DIR)
-    assert addressbook_result.returncode == 0, f"Type checking failed: {addressbook_result.stdout}"
-
-    advanced_code = """
+""",
+    "test_python_struct_reader_inputs.py": """
 import advanced_features_capnp
 
 nested_builder = advanced_features_capnp.AdvancedContainer.Nested.new_message(note="builder")
@@ -385,18 +385,10 @@ container.nested = nested_builder
 container.nested = nested_reader
 
 note: str = container.nested.note
-"""
-
-    advanced_file = basic_stubs / "test_python_struct_reader_inputs.py"
-    advanced_file.write_text(advanced_code)
-
-    advanced_result = run_pyright(advanced_file, cwd=TESTS_DIR)
-    assert advanced_result.returncode == 0, f"Type checking failed: {advanced_result.stdout}"
-
-
-def test_rpc_python_lists_type_check(calculator_stubs: Path, basic_stubs: Path) -> None:
-    """Pyright should accept raw Python lists for RPC list params and list results."""
-    calculator_code = """
+""",
+}
+_RPC_LIST_SAMPLES = {
+    "test_python_list_inputs.py": """
 import calculator_capnp
 
 class FunctionImpl(calculator_capnp.Calculator.Function.Server):
@@ -416,14 +408,8 @@ async def use_function() -> float:
     sent = await request.send()
     called = await function.call([4.0, 5.0])
     return sent.value + called.value
-"""
-    calculator_file = calculator_stubs / "test_python_list_inputs.py"
-    calculator_file.write_text(calculator_code)
-
-    calculator_result = run_pyright(calculator_file, cwd=TESTS_DIR)
-    assert calculator_result.returncode == 0, f"Type checking failed: {calculator_result.stdout}"
-
-    list_result_code = """
+""",
+    "test_list_result_python_inputs.py": """
 import list_result_capnp
 
 item_builder = list_result_capnp.Item.new_message(name="builder", value=2)
@@ -432,9 +418,34 @@ item_reader = item_builder.as_reader()
 class ItemServiceImpl(list_result_capnp.ItemService.Server):
     async def getItems(self, _context: object, **kwargs: object):
         return [{"name": "demo", "value": 1}, item_builder, item_reader]
-"""
-    list_result_file = basic_stubs / "test_list_result_python_inputs.py"
-    list_result_file.write_text(list_result_code)
+""",
+}
+
+
+@pytest.fixture(scope="module")
+def list_input_pyright_results(
+    addressbook_stubs: Path,
+    basic_stubs: Path,
+    calculator_stubs: Path,
+    tmp_path_factory: pytest.TempPathFactory,
+) -> dict[str, PyrightResult]:
+    """Type-check every list-input sample with a single pyright run and key the results by sample filename."""
+    sample_dir = tmp_path_factory.mktemp("list_input_pyright")
+    samples = {**_STRUCT_INPUT_SAMPLES, **_RPC_LIST_SAMPLES}
+    sample_files = write_pyright_sample_project(sample_dir, samples, addressbook_stubs, basic_stubs, calculator_stubs)
+    results = run_pyright_by_file(*sample_files, cwd=sample_dir)
+    return {sample_file.name: results[sample_file.resolve()] for sample_file in sample_files}
+
+
+def test_struct_python_inputs_type_check(list_input_pyright_results: dict[str, PyrightResult]) -> None:
+    """Pyright should accept mixed struct dict/Builder/Reader inputs."""
+    for filename in _STRUCT_INPUT_SAMPLES:
+        result = list_input_pyright_results[filename]
+        assert result.error_count == 0, f"Type checking failed: {result.stdout}"
 
-    list_result_result = run_pyright(list_result_file, cwd=TESTS_DIR)
-    assert list_result_result.returncode == 0, f"Type checking failed: {list_result_result.stdout}"
+
+def test_rpc_python_lists_type_check(list_input_pyright_results: dict[str, PyrightResult]) -> None:
+    """Pyright should accept raw Python lists for RPC list params and list results."""
+    for filename in _RPC_LIST_SAMPLES:
+        result = list_input_pyright_results[filename]
+        assert result.error_count == 0, f"Type checking failed: {result.stdout}"
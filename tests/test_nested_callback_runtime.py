@@ -11,7 +11,7 @@ from typing import Any
 
 import capnp
 
-from tests.test_helpers import run_command
+from tests.test_helpers import run_pyright
 
 TESTS_DIR = Path(__file__).parent
 REPO_ROOT = TESTS_DIR.parent
@@ -71,35 +71,35 @@ def test_generated_runtime_uses_typed_schema_paths() -> None:
     runtime_file = (
         TESTS_DIR / "_generated" / "examples" / "fbp_nested_callback" / "fbp_nested_callback_capnp" / "__init__.py"
     )
-    content = runtime_file.read_text()
+    content = runtime_file.read_bytes()
     assert (
-        content.splitlines()[0]
-        == "# pyright: reportAttributeAccessIssue=false, reportArgumentType=false, reportUnknownMemberType=false"
+        content.split(b"\n", 1)[0]
+        == b"# pyright: reportAttributeAccessIssue=false, reportArgumentType=false, reportUnknownMemberType=false"
     )
-    assert "_require_" not in content
-    assert "import schema_capnp" in content
-    assert "capnp.schema_capnp" not in content
-    assert "sys.modules.get" not in content
-    assert "capnp.add_import_hook()" not in content
-    assert "from typing import TYPE_CHECKING" not in content
-    assert "cast(" not in content
-    assert "# pyright: ignore[reportUnknownArgumentType]" in content
-    assert "def _as_struct_schema" not in content
-    assert "def _struct_field" not in content
-    assert "def _interface_method" not in content
-    assert "_field_schema(" not in content
-    assert "_method_param_type(" not in content
-    assert "_method_result_type(" not in content
-    assert "from capnp.lib.capnp import _InterfaceModule" in content
-    assert "from .types.modules import" not in content
+    assert b"_require_" not in content
+    assert b"import schema_capnp" in content
+    assert b"capnp.schema_capnp" not in content
+    assert b"sys.modules.get" not in content
+    assert b"capnp.add_import_hook()" not in content
+    assert b"from typing import TYPE_CHECKING" not in content
+    assert b"cast(" not in content
+    assert b"# pyright: ignore[reportUnknownArgumentType]" in content
+    assert b"def _as_struct_schema" not in content
+    assert b"def _struct_field" not in content
+    assert b"def _interface_method" not in content
+    assert b"_field_schema(" not in content
+    assert b"_method_param_type(" not in content
+    assert b"_method_result_type(" not in content
+    assert b"from capnp.lib.capnp import _InterfaceModule" in content
+    assert b"from .types.modules import" not in content
     assert re.search(
-        r'Channel\.schema\.methods\["registerStatsCallback"\]\.param_type\.fields\["callback"\]\.schema', content
+        rb'Channel\.schema\.methods\["registerStatsCallback"\]\.param_type\.fields\["callback"\]\.schema', content
     )
     assert re.search(
-        r'Channel\.StatsCallback\.schema\.methods\["status"\]\.param_type\.fields\["stats"\]\.schema', content
+        rb'Channel\.StatsCallback\.schema\.methods\["status"\]\.param_type\.fields\["stats"\]\.schema', content
     )
     assert re.search(
-        r'Channel\.schema\.methods\["registerStatsCallback"\]\.result_type\.fields\["unregisterCallback"\]\.schema',
+        rb'Channel\.schema\.methods\["registerStatsCallback"\]\.result_type\.fields\["unregisterCallback"\]\.schema',
         content,
     )
 
@@ -107,19 +107,19 @@ def test_generated_runtime_uses_typed_schema_paths() -> None:
 def test_schema_helpers_are_separated_into_types_schemas() -> None:
     """Public schema helper aliases should live in `types.schemas` while modules keep the canonical nested classes."""
     types_dir = TESTS_DIR / "_generated" / "examples" / "fbp_nested_callback" / "fbp_nested_callback_capnp" / "types"
-    modules_content = (types_dir / "modules.pyi").read_text()
-    schemas_content = (types_dir / "schemas.pyi").read_text()
+    modules_content = (types_dir / "modules.pyi").read_bytes()
+    schemas_content = (types_dir / "schemas.pyi").read_bytes()
 
-    assert "from . import schemas as schemas" in modules_content
-    assert "def schema(self) -> schemas._ChannelSchema" in modules_content
-    assert "def schema(self) -> schemas._ChannelStatsCallbackSchema" in modules_content
-    assert "class _ChannelSchema(" in modules_content
-    assert "class _StatsCallbackSchema(" in modules_content
+    assert b"from . import schemas as schemas" in modules_content
+    assert b"def schema(self) -> schemas._ChannelSchema" in modules_content
+    assert b"def schema(self) -> schemas._ChannelStatsCallbackSchema" in modules_content
+    assert b"class _ChannelSchema(" in modules_content
+    assert b"class _StatsCallbackSchema(" in modules_content
 
-    assert "from . import modules as modules" in schemas_content
-    assert "type _ChannelSchema = modules._ChannelInterfaceModule._ChannelSchema" in schemas_content
+    assert b"from . import modules as modules" in schemas_content
+    assert b"type _ChannelSchema = modules._ChannelInterfaceModule._ChannelSchema" in schemas_content
     assert (
-        "type _ChannelStatsCallbackSchema = modules._ChannelInterfaceModule._StatsCallbackInterfaceModule._StatsCallbackSchema"
+        b"type _ChannelStatsCallbackSchema = modules._ChannelInterfaceModule._StatsCallbackInterfaceModule._StatsCallbackSchema"
         in schemas_content
     )
 
@@ -139,5 +139,5 @@ _ = (status_method, timestamp_field)
 """.strip(),
     )
 
-    result = run_command(["basedpyright", str(sample)], cwd=REPO_ROOT)
-    assert result.returncode == 0, result.stdout or result.stderr
+    result = run_pyright(sample, cwd=REPO_ROOT, executable="basedpyright")
+    assert result.error_count == 0, result.stdout or result.stderr
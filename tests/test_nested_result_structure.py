@@ -12,101 +12,93 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+import pytest
+
 from tests.test_helpers import read_generated_types_combined
 
 if TYPE_CHECKING:
     from pathlib import Path
 
 
+@pytest.fixture(scope="module")
+def calculator_content(calculator_stubs: Path) -> str:
+    """Get the calculator helper stubs once for the module."""
+    return read_generated_types_combined(calculator_stubs / "calculator_capnp")
+
+
+@pytest.fixture(scope="module")
+def common_content(zalfmas_stubs: Path) -> str:
+    """Get the zalfmas common helper stubs once for the module."""
+    return read_generated_types_combined(zalfmas_stubs / "mas/schema/common/common_capnp")
+
+
 class TestNestedResultStructure:
     """Test that Result protocols are properly flattened to module top level."""
 
-    def test_client_result_nested_in_client(self, calculator_stubs: Path) -> None:
+    def test_client_result_nested_in_client(self, calculator_content: str) -> None:
         """Test that Client Result protocols are top-level helpers."""
-        content = read_generated_types_combined(calculator_stubs / "calculator_capnp")
+        assert "class CalculatorClient(_DynamicCapabilityClient):" in calculator_content
+        assert "class EvaluateResult(Awaitable[EvaluateResult], Protocol):" in calculator_content
+        assert "def evaluate(" in calculator_content
+        assert "-> EvaluateResult:" in calculator_content
 
-        assert "class CalculatorClient(_DynamicCapabilityClient):" in content
-        assert "class EvaluateResult(Awaitable[EvaluateResult], Protocol):" in content
-        assert "def evaluate(" in content
-        assert "-> EvaluateResult:" in content
-
-    def test_server_result_nested_in_server(self, calculator_stubs: Path) -> None:
+    def test_server_result_nested_in_server(self, calculator_content: str) -> None:
         """Test that Server Result helpers are top-level."""
-        content = read_generated_types_combined(calculator_stubs / "calculator_capnp")
-
-        assert "class EvaluateServerResult(_DynamicStructBuilder):" in content
-        assert "def results(self) -> EvaluateServerResult: ..." in content
+        assert "class EvaluateServerResult(_DynamicStructBuilder):" in calculator_content
+        assert "def results(self) -> EvaluateServerResult: ..." in calculator_content
 
-    def test_client_method_returns_client_result(self, calculator_stubs: Path) -> None:
+    def test_client_method_returns_client_result(self, calculator_content: str) -> None:
         """Test that client methods return top-level Result helpers."""
-        content = read_generated_types_combined(calculator_stubs / "calculator_capnp")
+        assert "def evaluate(" in calculator_content
+        assert "-> EvaluateResult:" in calculator_content
 
-        assert "def evaluate(" in content
-        assert "-> EvaluateResult:" in content
-
-    def test_request_send_returns_client_result(self, calculator_stubs: Path) -> None:
+    def test_request_send_returns_client_result(self, calculator_content: str) -> None:
         """Test that Request.send() returns a top-level Result helper."""
-        content = read_generated_types_combined(calculator_stubs / "calculator_capnp")
-
-        assert "class EvaluateRequest(Protocol):" in content
-        assert "def send(self) -> EvaluateResult:" in content
+        assert "class EvaluateRequest(Protocol):" in calculator_content
+        assert "def send(self) -> EvaluateResult:" in calculator_content
 
-    def test_callcontext_results_points_to_server_result(self, calculator_stubs: Path) -> None:
+    def test_callcontext_results_points_to_server_result(self, calculator_content: str) -> None:
         """Test that CallContext.results points to a top-level ServerResult helper."""
-        content = read_generated_types_combined(calculator_stubs / "calculator_capnp")
+        assert "class EvaluateCallContext(Protocol):" in calculator_content
+        assert "@property" in calculator_content
+        assert "def results(self) -> EvaluateServerResult: ..." in calculator_content
 
-        assert "class EvaluateCallContext(Protocol):" in content
-        assert "@property" in content
-        assert "def results(self) -> EvaluateServerResult: ..." in content
-
-    def test_result_tuple_stays_under_server(self, calculator_stubs: Path) -> None:
+    def test_result_tuple_stays_under_server(self, calculator_content: str) -> None:
         """Test that ResultTuple helpers are flattened to module top level."""
-        content = read_generated_types_combined(calculator_stubs / "calculator_capnp")
-
-        assert "class EvaluateResultTuple(NamedTuple):" in content
+        assert "class EvaluateResultTuple(NamedTuple):" in calculator_content
 
 
 class TestNestedResultsAtDeeperLevels:
     """Test that nested Results work at deeper interface nesting levels."""
 
-    def test_nested_interface_client_result(self, calculator_stubs: Path) -> None:
+    def test_nested_interface_client_result(self, calculator_content: str) -> None:
         """Test nested interface (Calculator.Value) has top-level Result helpers."""
-        content = read_generated_types_combined(calculator_stubs / "calculator_capnp")
-
-        assert "def read(self) -> ReadResult:" in content
+        assert "def read(self) -> ReadResult:" in calculator_content
 
-    def test_nested_interface_server_result(self, calculator_stubs: Path) -> None:
+    def test_nested_interface_server_result(self, calculator_content: str) -> None:
         """Test nested interface Server uses top-level ServerResult helpers."""
-        content = read_generated_types_combined(calculator_stubs / "calculator_capnp")
+        assert "class ReadServerResult(_DynamicStructBuilder):" in calculator_content
+        assert "def results(self) -> ReadServerResult: ..." in calculator_content
 
-        assert "class ReadServerResult(_DynamicStructBuilder):" in content
-        assert "def results(self) -> ReadServerResult: ..." in content
-
-    def test_nested_interface_request_send(self, calculator_stubs: Path) -> None:
+    def test_nested_interface_request_send(self, calculator_content: str) -> None:
         """Test nested interface Request.send() returns a top-level Result helper."""
-        content = read_generated_types_combined(calculator_stubs / "calculator_capnp")
-
-        assert "class ReadRequest(Protocol):" in content
-        assert "def send(self) -> ReadResult:" in content
+        assert "class ReadRequest(Protocol):" in calculator_content
+        assert "def send(self) -> ReadResult:" in calculator_content
 
-    def test_nested_interface_callcontext(self, calculator_stubs: Path) -> None:
+    def test_nested_interface_callcontext(self, calculator_content: str) -> None:
         """Test nested interface CallContext.results points to a top-level ServerResult helper."""
-        content = read_generated_types_combined(calculator_stubs / "calculator_capnp")
-
-        assert "class ReadCallContext(Protocol):" in content
-        assert "@property" in content
-        assert "def results(self) -> ReadServerResult: ..." in content
+        assert "class ReadCallContext(Protocol):" in calculator_content
+        assert "@property" in calculator_content
+        assert "def results(self) -> ReadServerResult: ..." in calculator_content
 
 
 class TestAnyPointerTypeDifferences:
     """Test that AnyPointer types differ between Client and Server Results."""
 
-    def test_client_anypointer_uses_dynamic_object_reader(self, zalfmas_stubs: Path) -> None:
+    def test_client_anypointer_uses_dynamic_object_reader(self, common_content: str) -> None:
         """Test that Client Result uses _DynamicObjectReader for AnyPointer."""
-        content = read_generated_types_combined(zalfmas_stubs / "mas/schema/common/common_capnp")
-
         # Holder.ValueResult should use _DynamicObjectReader
-        lines = content.split("\n")
+        lines = common_content.splitlines()
         in_value_result = False
         found_dynamic_object_reader = False
 
@@ -119,23 +111,19 @@ class TestAnyPointerTypeDifferences:
 
         assert found_dynamic_object_reader, "Client Result should use _DynamicObjectReader for AnyPointer"
 
-    def test_server_anypointer_uses_broad_union(self, zalfmas_stubs: Path) -> None:
+    def test_server_anypointer_uses_broad_union(self, common_content: str) -> None:
         """Test that Server Result uses broad type union for AnyPointer."""
-        content = read_generated_types_combined(zalfmas_stubs / "mas/schema/common/common_capnp")
-
         # ServerResult should use broad union (now via AnyPointer type alias)
-        assert "type AnyPointer = (" in content
-        assert "_DynamicCapabilityServer" in content
-        assert "_DynamicStructBuilder" in content
-        assert "class ValueServerResult(_DynamicStructBuilder):" in content
+        assert "type AnyPointer = (" in common_content
+        assert "_DynamicCapabilityServer" in common_content
+        assert "_DynamicStructBuilder" in common_content
+        assert "class ValueServerResult(_DynamicStructBuilder):" in common_content
 
-    def test_server_result_tuple_uses_broad_union(self, zalfmas_stubs: Path) -> None:
+    def test_server_result_tuple_uses_broad_union(self, common_content: str) -> None:
         """Test that Server ResultTuple also uses broad type union for AnyPointer."""
-        content = read_generated_types_combined(zalfmas_stubs / "mas/schema/common/common_capnp")
-
         # ValueResultTuple should also use AnyPointer type alias
-        assert "class ValueResultTuple(NamedTuple):" in content
-        lines = content.split("\n")
+        assert "class ValueResultTuple(NamedTuple):" in common_content
+        lines = common_content.splitlines()
         in_tuple = False
         found_anypointer = False
 
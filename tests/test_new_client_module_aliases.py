@@ -15,20 +15,20 @@ if TYPE_CHECKING:
 def test_new_client_uses_module_aliases_for_current_interface(generate_calculator_stubs: Path) -> None:
     """Test that _new_client uses module alias for the current interface's Server type."""
     stub_file = generate_calculator_stubs / "calculator_capnp" / "types" / "modules.pyi"
-    content = stub_file.read_text()
+    content = stub_file.read_bytes()
 
     # Value._new_client should accept _DynamicCapabilityServer
-    assert "def _new_client(self, server: _DynamicCapabilityServer)" in content, (
+    assert b"def _new_client(self, server: _DynamicCapabilityServer)" in content, (
         "_new_client should use _DynamicCapabilityServer"
     )
 
     # Function._new_client should accept _DynamicCapabilityServer
-    assert "def _new_client(self, server: _DynamicCapabilityServer)" in content, (
+    assert b"def _new_client(self, server: _DynamicCapabilityServer)" in content, (
         "_new_client should use _DynamicCapabilityServer"
     )
 
     # Calculator._new_client should return the dedicated clients helper type
-    assert "def _new_client(self, server: _DynamicCapabilityServer) -> clients.CalculatorClient:" in content, (
+    assert b"def _new_client(self, server: _DynamicCapabilityServer) -> clients.CalculatorClient:" in content, (
         "_new_client should use the clients helper return type"
     )
 
@@ -59,7 +59,7 @@ def test_new_client_uses_module_aliases_for_inherited_interfaces(zalfmas_stubs:
 
     # Ensure it does NOT use the old incorrect naming
     # (checking that we don't have both old and new - only new should exist)
-    lines = content.split("\n")
+    lines = content.splitlines()
     new_client_lines = [line for line in lines if "_new_client" in line and "self, server:" in line]
 
     for line in new_client_lines:
@@ -79,15 +79,15 @@ def test_new_client_uses_module_aliases_for_inherited_interfaces(zalfmas_stubs:
 def test_new_client_nested_interface_uses_full_module_path(basic_stubs: Path) -> None:
     """Test that nested interface _new_client methods use full module path."""
     stub_file = basic_stubs / "channel_capnp" / "types" / "modules.pyi"
-    content = stub_file.read_text()
+    content = stub_file.read_bytes()
 
     # Channel.Reader._new_client should use _DynamicCapabilityServer
-    assert "def _new_client(self, server: _DynamicCapabilityServer)" in content, (
+    assert b"def _new_client(self, server: _DynamicCapabilityServer)" in content, (
         "Nested interface _new_client should use _DynamicCapabilityServer"
     )
 
     # Channel.Writer._new_client should use _DynamicCapabilityServer
-    assert "def _new_client(self, server: _DynamicCapabilityServer)" in content, (
+    assert b"def _new_client(self, server: _DynamicCapabilityServer)" in content, (
         "Nested interface _new_client should use _DynamicCapabilityServer"
     )
 
@@ -95,17 +95,17 @@ def test_new_client_nested_interface_uses_full_module_path(basic_stubs: Path) ->
 def test_new_client_return_types_use_client_module_imports(zalfmas_stubs: Path) -> None:
     """Test that _new_client return types use the dedicated client helper module."""
     stub_file = zalfmas_stubs / "mas/schema/common/common_capnp" / "types" / "modules.pyi"
-    content = stub_file.read_text()
+    content = stub_file.read_bytes()
 
     # _new_client should return client helper-module types
-    assert "-> clients.IdentifiableClient:" in content
-    assert "-> clients.HolderClient:" in content
-    assert "-> clients.IdentifiableHolderClient:" in content
+    assert b"-> clients.IdentifiableClient:" in content
+    assert b"-> clients.HolderClient:" in content
+    assert b"-> clients.IdentifiableHolderClient:" in content
 
     # The module should reference the dedicated clients helper module explicitly.
     assert (
-        "from . import clients as clients" in content
-        or "from mas.schema.common.common_capnp.types import clients as clients" in content
+        b"from . import clients as clients" in content
+        or b"from mas.schema.common.common_capnp.types import clients as clients" in content
     )
 
 
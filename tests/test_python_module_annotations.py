@@ -2,16 +2,25 @@
 
 from pathlib import Path
 
+import pytest
+
 from tests.test_helpers import read_generated_types_combined, run_generator
 
 
-def test_module_annotation_creates_directory_structure(tmp_path: Path) -> None:
-    """Test that $Python.module() creates the correct directory structure."""
+@pytest.fixture(scope="module")
+def climate_output_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Generate the annotated climate schema once; its tests only read the output."""
     # Use zalfmas climate schema which has $Python.module("mas.schema.climate")
     schema_path = Path("tests/schemas/zalfmas/climate.capnp")
-    output_dir = tmp_path / "output"
+    output_dir = tmp_path_factory.mktemp("climate") / "output"
+
+    run_generator([str(schema_path)], output_dir, import_paths=["tests/schemas/zalfmas"], skip_pyright=True)
+    return output_dir
 
-    run_generator(["-p", str(schema_path), "-I", "tests/schemas/zalfmas", "-o", str(output_dir), "--no-pyright"])
+
+def test_module_annotation_creates_directory_structure(climate_output_dir: Path) -> None:
+    """Test that $Python.module() creates the correct directory structure."""
+    output_dir = climate_output_dir
 
     # Check that the directory structure was created according to the annotation
     expected_path = output_dir / "mas" / "schema" / "climate" / "climate_capnp" / "types" / "modules.pyi"
@@ -30,14 +39,9 @@ def test_module_annotation_creates_directory_structure(tmp_path: Path) -> None:
     assert (output_dir / "mas" / "schema" / "climate" / "__init__.pyi").exists()
 
 
-def test_module_annotation_uses_absolute_imports(tmp_path: Path) -> None:
+def test_module_annotation_uses_absolute_imports(climate_output_dir: Path) -> None:
     """Test that stubs with $Python.module() use absolute imports."""
-    schema_path = Path("tests/schemas/zalfmas/climate.capnp")
-    output_dir = tmp_path / "output"
-
-    run_generator(["-p", str(schema_path), "-I", "tests/schemas/zalfmas", "-o", str(output_dir), "--no-pyright"])
-
-    package_dir = output_dir / "mas" / "schema" / "climate" / "climate_capnp"
+    package_dir = climate_output_dir / "mas" / "schema" / "climate" / "climate_capnp"
     modules_path = package_dir / "types" / "modules.pyi"
     schemas_path = package_dir / "types" / "schemas.pyi"
     content = read_generated_types_combined(package_dir)
@@ -61,47 +65,45 @@ def test_module_annotation_uses_absolute_imports(tmp_path: Path) -> None:
     assert "from . import modules as modules" not in schemas_content
 
 
-def test_schema_without_annotation_still_works(tmp_path: Path) -> None:
-    """Test that schemas without $Python.module() still work with relative imports."""
-    # Use addressbook schema which doesn't have Python module annotations
-    schema_path = Path("tests/schemas/examples/addressbook/addressbook.capnp")
-    output_dir = tmp_path / "output"
-
-    run_generator(["-p", str(schema_path), "-o", str(output_dir), "--no-pyright"])
+@pytest.fixture(scope="module")
+def mixed_output_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Generate an annotated and a non-annotated schema into one directory once for the module.
 
-    # Without annotation, should create flat structure
-    expected_path = output_dir / "addressbook_capnp" / "types" / "modules.pyi"
-    assert expected_path.exists(), f"Expected stub at {expected_path}"
-
-
-def test_mixed_annotated_and_non_annotated_schemas(tmp_path: Path) -> None:
-    """Test that annotated and non-annotated schemas can coexist."""
+    The tests below only read this tree and must not modify it.
+    """
     # Generate both types of schemas, but use different import paths to avoid conflicts
     annotated_schema = Path("tests/schemas/zalfmas/date.capnp")
     non_annotated_schema = Path("tests/schemas/examples/addressbook/addressbook.capnp")
-    output_dir = tmp_path / "output"
+    output_dir = tmp_path_factory.mktemp("mixed") / "output"
 
-    run_generator(["-p", str(annotated_schema), "-I", "tests/schemas/zalfmas", "-o", str(output_dir), "--no-pyright"])
+    run_generator([str(annotated_schema)], output_dir, import_paths=["tests/schemas/zalfmas"], skip_pyright=True)
+    run_generator([str(non_annotated_schema)], output_dir, skip_pyright=True)
+    return output_dir
 
-    run_generator(["-p", str(non_annotated_schema), "-o", str(output_dir), "--no-pyright"])
 
+def test_schema_without_annotation_still_works(mixed_output_dir: Path) -> None:
+    """Test that schemas without $Python.module() still work with relative imports."""
+    # addressbook doesn't have Python module annotations
+    # Without annotation, should create flat structure
+    expected_path = mixed_output_dir / "addressbook_capnp" / "types" / "modules.pyi"
+    assert expected_path.exists(), f"Expected stub at {expected_path}"
+
+
+def test_mixed_annotated_and_non_annotated_schemas(mixed_output_dir: Path) -> None:
+    """Test that annotated and non-annotated schemas can coexist."""
     # Annotated schema should have module structure
-    annotated_path = output_dir / "mas" / "schema" / "common" / "date_capnp" / "types" / "modules.pyi"
+    annotated_path = mixed_output_dir / "mas" / "schema" / "common" / "date_capnp" / "types" / "modules.pyi"
     assert annotated_path.exists(), "Annotated schema should use module structure"
 
     # Non-annotated schema should have flat structure
-    non_annotated_path = output_dir / "addressbook_capnp" / "types" / "modules.pyi"
+    non_annotated_path = mixed_output_dir / "addressbook_capnp" / "types" / "modules.pyi"
     assert non_annotated_path.exists(), "Non-annotated schema should use flat structure"
 
 
-def test_nested_module_paths(tmp_path: Path) -> None:
+def test_nested_module_paths(mixed_output_dir: Path) -> None:
     """Test that deeply nested module paths work correctly."""
     # date.capnp has $Python.module("mas.schema.common")
-    schema_path = Path("tests/schemas/zalfmas/date.capnp")
-    output_dir = tmp_path / "output"
-
-    run_generator(["-p", str(schema_path), "-I", "tests/schemas/zalfmas", "-o", str(output_dir), "--no-pyright"])
-
+    output_dir = mixed_output_dir
     expected_path = output_dir / "mas" / "schema" / "common" / "date_capnp" / "types" / "modules.pyi"
     assert expected_path.exists(), f"Expected stub at {expected_path}"
 
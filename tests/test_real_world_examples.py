@@ -21,7 +21,7 @@ from typing import TypedDict
 
 import pytest
 
-from tests.test_helpers import log_summary, run_pyright
+from tests.test_helpers import log_summary, run_pyright_by_file
 
 # Base directories
 TESTS_DIR = Path(__file__).parent
@@ -169,12 +169,14 @@ class TestExampleFunctionality:
             [path for path in (generated_examples_dir, tests_dir, python_path) if path],
         )
 
-        for python_file in example.get_python_paths():
-            if not python_file.exists():
-                continue
+        python_files = [python_file for python_file in example.get_python_paths() if python_file.exists()]
+        if not python_files:
+            return
 
-            result = run_pyright(python_file, env=env)
-            assert result.returncode == 0, f"Type checking failed for {python_file.name}"
+        results = run_pyright_by_file(*python_files, env=env)
+        for python_file in python_files:
+            result = results[python_file.resolve()]
+            assert result.error_count == 0, f"Type checking failed for {python_file.name}:\n{result.stdout}"
 
 
 # Summary test to show overall status
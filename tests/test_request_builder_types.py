@@ -9,11 +9,16 @@ from pathlib import Path
 
 import pytest
 
-from tests.test_helpers import log_summary, read_generated_types_combined
+from tests.test_helpers import class_block, log_summary, read_generated_types_combined
 
 TESTS_DIR = Path(__file__).parent
 
 
+def _first_line_containing(block: str, needle: str) -> str | None:
+    """Return the first line of a class block that contains ``needle``."""
+    return next((line for line in block.splitlines() if needle in line), None)
+
+
 class TestRequestBuilderStructure:
     """Test that request builders have proper structure."""
 
@@ -25,21 +30,9 @@ class TestRequestBuilderStructure:
         assert "class EvaluateRequest(Protocol):" in stub_content
 
         # Should have expression field with Expression type (allows dict for init)
-        lines = stub_content.split("\n")
-        in_evaluate_request = False
-        found_expression_field = False
-
-        for line in lines:
-            if "class EvaluateRequest(Protocol):" in line:
-                in_evaluate_request = True
-            elif in_evaluate_request and "expression:" in line:
-                assert "ExpressionBuilder" in line, f"Expected Expression type, got: {line}"
-                found_expression_field = True
-                break
-            elif in_evaluate_request and (line.startswith(("    def ", "class "))):
-                break
-
-        assert found_expression_field, "EvaluateRequest should have expression field"
+        expression_field = _first_line_containing(class_block(stub_content, "EvaluateRequest"), "expression:")
+        assert expression_field is not None, "EvaluateRequest should have expression field"
+        assert "ExpressionBuilder" in expression_field, f"Expected Expression type, got: {expression_field}"
 
     def test_deffunction_request_has_fields(self, generate_calculator_stubs: Path) -> None:
         """Test that DeffunctionRequest has paramCount and body fields."""
@@ -49,26 +42,13 @@ class TestRequestBuilderStructure:
         assert "class DeffunctionRequest(Protocol):" in stub_content
 
         # Should have both fields
-        lines = stub_content.split("\n")
-        in_deffunction_request = False
-        found_param_count = False
-        found_body = False
-
-        for line in lines:
-            if "class DeffunctionRequest(Protocol):" in line:
-                in_deffunction_request = True
-            elif in_deffunction_request and "paramCount:" in line:
-                assert "int" in line
-                found_param_count = True
-            elif in_deffunction_request and "body:" in line:
-                assert "ExpressionBuilder" in line, f"Expected Expression type, got: {line}"
-                found_body = True
-                break  # Found both fields, exit
-            elif in_deffunction_request and line.startswith("class "):
-                break
-
-        assert found_param_count, "DeffunctionRequest should have paramCount field"
-        assert found_body, "DeffunctionRequest should have body field"
+        request_block = class_block(stub_content, "DeffunctionRequest")
+        param_count_field = _first_line_containing(request_block, "paramCount:")
+        body_field = _first_line_containing(request_block, "body:")
+        assert param_count_field is not None, "DeffunctionRequest should have paramCount field"
+        assert "int" in param_count_field
+        assert body_field is not None, "DeffunctionRequest should have body field"
+        assert "ExpressionBuilder" in body_field, f"Expected Expression type, got: {body_field}"
 
     def test_call_request_has_params_field(self, generate_calculator_stubs: Path) -> None:
         """Test that CallRequest has params field."""
@@ -89,85 +69,36 @@ class TestRequestBuilderSendMethod:
         stub_content = read_generated_types_combined(generate_calculator_stubs / "calculator_capnp")
 
         # Find EvaluateRequest and check its send method
-        lines = stub_content.split("\n")
-        in_evaluate_request = False
-        found_send = False
-
-        for line in lines:
-            if "class EvaluateRequest(Protocol):" in line:
-                in_evaluate_request = True
-            elif in_evaluate_request and "def send(self)" in line:
-                # Should return fully qualified result type
-                assert "EvaluateResult:" in line, f"Expected EvaluateResult return, got: {line}"
-                found_send = True
-                break
-            elif in_evaluate_request and line.startswith("class "):
-                break
-
-        assert found_send, "EvaluateRequest should have send() method"
+        send_method = _first_line_containing(class_block(stub_content, "EvaluateRequest"), "def send(self)")
+        assert send_method is not None, "EvaluateRequest should have send() method"
+        assert "EvaluateResult:" in send_method, f"Expected EvaluateResult return, got: {send_method}"
 
     def test_deffunction_request_send_returns_deffunction_result(self, generate_calculator_stubs: Path) -> None:
         """Test that DeffunctionRequest.send() returns DeffunctionResult."""
         stub_content = read_generated_types_combined(generate_calculator_stubs / "calculator_capnp")
 
         # Find DeffunctionRequest and check its send method
-        lines = stub_content.split("\n")
-        in_request = False
-        found_send = False
-
-        for line in lines:
-            if "class DeffunctionRequest(Protocol):" in line:
-                in_request = True
-            elif in_request and "def send(self)" in line:
-                assert "DeffunctionResult:" in line
-                found_send = True
-                break
-            elif in_request and line.startswith("class "):
-                break
-
-        assert found_send, "DeffunctionRequest should have send() method"
+        send_method = _first_line_containing(class_block(stub_content, "DeffunctionRequest"), "def send(self)")
+        assert send_method is not None, "DeffunctionRequest should have send() method"
+        assert "DeffunctionResult:" in send_method
 
     def test_read_request_send_returns_read_result(self, generate_calculator_stubs: Path) -> None:
         """Test that ReadRequest.send() returns ReadResult."""
         stub_content = read_generated_types_combined(generate_calculator_stubs / "calculator_capnp")
 
         # Find ReadRequest and check its send method
-        lines = stub_content.split("\n")
-        in_request = False
-        found_send = False
-
-        for line in lines:
-            if "class ReadRequest(Protocol):" in line:
-                in_request = True
-            elif in_request and "def send(self)" in line:
-                assert "ReadResult:" in line
-                found_send = True
-                break
-            elif (in_request and line.startswith("    class ")) or (in_request and line.startswith("class ")):
-                break
-
-        assert found_send, "ReadRequest should have send() method"
+        send_method = _first_line_containing(class_block(stub_content, "ReadRequest"), "def send(self)")
+        assert send_method is not None, "ReadRequest should have send() method"
+        assert "ReadResult:" in send_method
 
     def test_call_request_send_returns_call_result(self, generate_calculator_stubs: Path) -> None:
         """Test that CallRequest.send() returns CallResult."""
         stub_content = read_generated_types_combined(generate_calculator_stubs / "calculator_capnp")
 
         # Find CallRequest and check its send method
-        lines = stub_content.split("\n")
-        in_request = False
-        found_send = False
-
-        for line in lines:
-            if "class CallRequest(Protocol):" in line:
-                in_request = True
-            elif in_request and "def send(self)" in line:
-                assert "CallResult:" in line
-                found_send = True
-                break
-            elif (in_request and line.startswith("    class ")) or (in_request and line.startswith("class ")):
-                break
-
-        assert found_send, "CallRequest should have send() method"
+        send_method = _first_line_containing(class_block(stub_content, "CallRequest"), "def send(self)")
+        assert send_method is not None, "CallRequest should have send() method"
+        assert "CallResult:" in send_method
 
 
 class TestRequestBuilderFieldAccess:
@@ -5,15 +5,36 @@ from __future__ import annotations
 import asyncio
 import importlib
 import re
-import sys
 from typing import TYPE_CHECKING
 
 import capnp
+import pytest
 
-from tests.test_helpers import read_generated_types_combined, run_pyright
+from tests.test_helpers import (
+    generated_modules_from,
+    read_generated_types_combined,
+    run_pyright,
+    write_pyright_sample_project,
+)
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
     from pathlib import Path
+    from types import ModuleType
+
+RUNTIME_MODULE_NAMES = (
+    "runtime_test_capnp",
+    "runtime_test_capnp.types.results.tuples",
+    "list_result_capnp",
+    "list_result_capnp.types.results.tuples",
+)
+
+
+@pytest.fixture(scope="module")
+def runtime_modules(basic_stubs: Path) -> Iterator[dict[str, ModuleType]]:
+    """Import the generated runtime and tuple modules once for every runtime check in this module."""
+    with generated_modules_from(basic_stubs, "runtime_test_capnp", "list_result_capnp"):
+        yield {module_name: importlib.import_module(module_name) for module_name in RUNTIME_MODULE_NAMES}
 
 
 async def _invoke_none_result_method(
@@ -21,27 +42,13 @@ async def _invoke_none_result_method(
     interface_module: capnp.lib.capnp._InterfaceModule,
     method_name: str,
 ) -> capnp.KjException:
-    async def new_connection(stream: capnp.lib.capnp.AsyncIoStream) -> None:
-        await capnp.TwoPartyServer(stream, bootstrap=server_impl).on_disconnect()
-
-    server = await capnp.AsyncIoStream.create_server(new_connection, "localhost", 0)
-    port = server.sockets[0].getsockname()[1]
+    # An in-process client still serializes results, so no TCP server or two-party connection is needed.
+    client = interface_module._new_client(server_impl)
 
     try:
-        async with server:
-            connection = await capnp.AsyncIoStream.create_connection(host="localhost", port=port)
-            client = capnp.TwoPartyClient(connection)
-            bootstrap = client.bootstrap().cast_as(interface_module)
-
-            try:
-                await getattr(bootstrap, method_name)()
-            except capnp.KjException as error:
-                return error
-            finally:
-                connection.close()
-    finally:
-        server.close()
-        await server.wait_closed()
+        await getattr(client, method_name)()
+    except capnp.KjException as error:
+        return error
 
     msg = f"{method_name} unexpectedly accepted None in a ResultTuple"
     raise AssertionError(msg)
@@ -93,7 +100,7 @@ def test_interface_result_tuple_accepts_forwarded_clients(basic_stubs: Path) ->
     assert "SubServiceClient" in match.group(1)
 
 
-def test_result_tuple_type_checking(basic_stubs: Path) -> None:
+def test_result_tuple_type_checking(basic_stubs: Path, tmp_path: Path) -> None:
     """Pyright should accept ResultTuple construction with assignment-friendly field types."""
     test_code = """
 import list_result_capnp
@@ -127,10 +134,9 @@ class ItemServiceImpl(list_result_capnp.ItemService.Server):
         return [{"name": "demo", "value": 1}]
 """
 
-    test_file = basic_stubs / "test_result_tuple_usage.py"
-    test_file.write_text(test_code)
+    [test_file] = write_pyright_sample_project(tmp_path, {"test_result_tuple_usage.py": test_code}, basic_stubs)
 
-    result = run_pyright(test_file)
+    result = run_pyright(test_file, cwd=tmp_path)
     assert result.returncode == 0, f"Type checking failed: {result.stdout}"
 
 
@@ -145,81 +151,54 @@ def test_result_tuple_runtime_helpers_live_under_tuple_module(basic_stubs: Path)
     assert "GetinterfaceResultTuple" in tuple_module_content
 
 
-def test_result_tuple_runtime_module_is_importable_and_instantiable(basic_stubs: Path) -> None:
+def test_result_tuple_runtime_module_is_importable_and_instantiable(runtime_modules: dict[str, ModuleType]) -> None:
     """Generated runtime tuple helpers should be importable and constructible from types.results.tuples."""
-    sys.path.insert(0, str(basic_stubs))
+    runtime_test_capnp = runtime_modules["runtime_test_capnp"]
+    tuples_module = runtime_modules["runtime_test_capnp.types.results.tuples"]
 
-    try:
-        runtime_test_capnp = importlib.import_module("runtime_test_capnp")
-        tuples_module = importlib.import_module("runtime_test_capnp.types.results.tuples")
-
-        result_tuple = tuples_module.GetstructResultTuple(info={"name": "demo", "value": 1})
+    result_tuple = tuples_module.GetstructResultTuple(info={"name": "demo", "value": 1})
 
-        assert result_tuple.info == {"name": "demo", "value": 1}
-        assert not hasattr(runtime_test_capnp, "GetstructResultTuple")
-    finally:
-        for module_name in (
-            "runtime_test_capnp.types.results.tuples",
-            "runtime_test_capnp.types.results",
-            "runtime_test_capnp.types",
-            "runtime_test_capnp",
-        ):
-            sys.modules.pop(module_name, None)
-        sys.path.remove(str(basic_stubs))
+    assert result_tuple.info == {"name": "demo", "value": 1}
+    assert not hasattr(runtime_test_capnp, "GetstructResultTuple")
 
 
-def test_result_tuple_none_values_are_rejected_at_runtime(basic_stubs: Path) -> None:
+def test_result_tuple_none_values_are_rejected_at_runtime(runtime_modules: dict[str, ModuleType]) -> None:
     """ResultTuple field types should stay non-optional because pycapnp rejects None during result serialization."""
-    sys.path.insert(0, str(basic_stubs))
-
-    try:
-        runtime_test_capnp = importlib.import_module("runtime_test_capnp")
-        list_result_capnp = importlib.import_module("list_result_capnp")
-        runtime_tuple_module = importlib.import_module("runtime_test_capnp.types.results.tuples")
-        list_tuple_module = importlib.import_module("list_result_capnp.types.results.tuples")
-
-        async def invoke_method(
-            server_impl: object,
-            interface_module: capnp.lib.capnp._InterfaceModule,
-            method_name: str,
-        ) -> capnp.KjException:
-            return await _invoke_none_result_method(server_impl, interface_module, method_name)
-
-        async def run_checks() -> dict[str, capnp.KjException]:
-            class TestServiceImpl(runtime_test_capnp.TestService.Server):
-                async def getPrimitive(self, _context: object, **_kwargs: object) -> object:
-                    return runtime_tuple_module.GetprimitiveResultTuple(result=None)
-
-                async def getStruct(self, _context: object, **_kwargs: object) -> object:
-                    return runtime_tuple_module.GetstructResultTuple(info=None)
-
-                async def getInterface(self, _context: object, **_kwargs: object) -> object:
-                    return runtime_tuple_module.GetinterfaceResultTuple(service=None)
-
-            class ItemServiceImpl(list_result_capnp.ItemService.Server):
-                async def getItems(self, _context: object, **_kwargs: object) -> object:
-                    return list_tuple_module.GetitemsResultTuple(items=None)
-
-            return {
-                "getPrimitive": await invoke_method(TestServiceImpl(), runtime_test_capnp.TestService, "getPrimitive"),
-                "getStruct": await invoke_method(TestServiceImpl(), runtime_test_capnp.TestService, "getStruct"),
-                "getInterface": await invoke_method(TestServiceImpl(), runtime_test_capnp.TestService, "getInterface"),
-                "getItems": await invoke_method(ItemServiceImpl(), list_result_capnp.ItemService, "getItems"),
-            }
-
-        errors = asyncio.run(capnp.run(run_checks()))
-        for method_name, error in errors.items():
-            assert "Value type mismatch" in str(error), f"{method_name} should reject None, got: {error}"
-    finally:
-        for module_name in (
-            "runtime_test_capnp.types.results.tuples",
-            "runtime_test_capnp.types.results",
-            "runtime_test_capnp.types",
-            "runtime_test_capnp",
-            "list_result_capnp.types.results.tuples",
-            "list_result_capnp.types.results",
-            "list_result_capnp.types",
-            "list_result_capnp",
-        ):
-            sys.modules.pop(module_name, None)
-        sys.path.remove(str(basic_stubs))
+    runtime_test_capnp = runtime_modules["runtime_test_capnp"]
+    list_result_capnp = runtime_modules["list_result_capnp"]
+    runtime_tuple_module = runtime_modules["runtime_test_capnp.types.results.tuples"]
+    list_tuple_module = runtime_modules["list_result_capnp.types.results.tuples"]
+
+    async def invoke_method(
+        server_impl: object,
+        interface_module: capnp.lib.capnp._InterfaceModule,
+        method_name: str,
+    ) -> capnp.KjException:
+        return await _invoke_none_result_method(server_impl, interface_module, method_name)
+
+    async def run_checks() -> dict[str, capnp.KjException]:
+        class TestServiceImpl(runtime_test_capnp.TestService.Server):
+            async def getPrimitive(self, _context: object, **_kwargs: object) -> object:
+                return runtime_tuple_module.GetprimitiveResultTuple(result=None)
+
+            async def getStruct(self, _context: object, **_kwargs: object) -> object:
+                return runtime_tuple_module.GetstructResultTuple(info=None)
+
+            async def getInterface(self, _context: object, **_kwargs: object) -> object:
+                return runtime_tuple_module.GetinterfaceResultTuple(service=None)
+
+        class ItemServiceImpl(list_result_capnp.ItemService.Server):
+            async def getItems(self, _context: object, **_kwargs: object) -> object:
+                return list_tuple_module.GetitemsResultTuple(items=None)
+
+        test_service = TestServiceImpl()
+        return {
+            "getPrimitive": await invoke_method(test_service, runtime_test_capnp.TestService, "getPrimitive"),
+            "getStruct": await invoke_method(test_service, runtime_test_capnp.TestService, "getStruct"),
+            "getInterface": await invoke_method(test_service, runtime_test_capnp.TestService, "getInterface"),
+            "getItems": await invoke_method(ItemServiceImpl(), list_result_capnp.ItemService, "getItems"),
+        }
+
+    errors = asyncio.run(capnp.run(run_checks()))
+    for method_name, error in errors.items():
+        assert "Value type mismatch" in str(error), f"{method_name} should reject None, got: {error}"
@@ -4,13 +4,7 @@ from pathlib import Path
 
 import pytest
 
-from tests.test_helpers import read_generated_types_combined, read_generated_types_file
-
-
-@pytest.fixture(scope="module")
-def dummy_stub_content(basic_stubs: Path) -> str:
-    """Get pre-generated dummy schema helper content."""
-    return read_generated_types_combined(basic_stubs / "dummy_capnp")
+from tests.test_helpers import class_block, read_generated_types_combined, read_generated_types_file
 
 
 @pytest.fixture(scope="module")
@@ -36,20 +30,8 @@ class TestStructReturnTypes:
 
     def test_base_class_has_no_field_properties(self, dummy_modules_content: str) -> None:
         """Module helper should not expose struct fields directly (these live on Reader/Builder)."""
-        lines = dummy_modules_content.split("\n")
-
-        in_base_class = False
-        has_struct_field = False
-
-        for _i, line in enumerate(lines):
-            if "class _TestAllTypesStructModule(_StructModule):" in line:
-                in_base_class = True
-            elif in_base_class and line.startswith("class ") and "_TestAllTypesStructModule" not in line:
-                break
-
-            if in_base_class and line.startswith("    def structField(self) ->"):
-                has_struct_field = True
-                break
+        module_block = class_block(dummy_modules_content, "_TestAllTypesStructModule")
+        has_struct_field = "\n    def structField(self) ->" in module_block
 
         assert not has_struct_field, "Module helper should NOT have direct field properties"
 
@@ -59,22 +41,22 @@ class TestStructReturnTypes:
             "Reader class should return TestAllTypesReader type"
         )
 
-    def test_builder_class_returns_builder_type(self, dummy_stub_content: str) -> None:
+    def test_builder_class_returns_builder_type(self, dummy_stub_text: str) -> None:
         """Builder class properties should return Builder types."""
-        assert "def structField(self) -> TestAllTypesBuilder:" in dummy_stub_content, (
+        assert "def structField(self) -> TestAllTypesBuilder:" in dummy_stub_text, (
             "Builder class getter should return TestAllTypesBuilder type"
         )
 
-    def test_builder_setter_accepts_union(self, dummy_stub_content: str) -> None:
+    def test_builder_setter_accepts_union(self, dummy_stub_text: str) -> None:
         """Builder class setters should accept Builder, Reader, or dict types (not base)."""
-        assert "@structField.setter" in dummy_stub_content
-        assert "value: TestAllTypesBuilder | readers.TestAllTypesReader | dict[str, Any]" in dummy_stub_content, (
+        assert "@structField.setter" in dummy_stub_text
+        assert "value: TestAllTypesBuilder | readers.TestAllTypesReader | dict[str, Any]" in dummy_stub_text, (
             "Builder setter should accept union of Builder, Reader, and dict types (not base)"
         )
 
-    def test_list_fields_follow_same_pattern(self, dummy_stub_content: str) -> None:
+    def test_list_fields_follow_same_pattern(self, dummy_stub_text: str) -> None:
         """List fields should follow the same narrowing pattern."""
-        assert "def structList(self) -> TestAllTypesListReader:" in dummy_stub_content, (
+        assert "def structList(self) -> TestAllTypesListReader:" in dummy_stub_text, (
             "Reader class list should be TestAllTypesListReader"
         )
 
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from pathlib import Path
 
-from tests.test_helpers import run_command
+from tests.test_helpers import run_pyright
 
 REPO_ROOT = Path(__file__).parent.parent
 
@@ -24,5 +24,5 @@ def test_generated_runtime_modules_type_check_with_basedpyright(
         zalfmas_stubs / "mas" / "schema" / "fbp" / "fbp_capnp" / "__init__.py",
         zalfmas_no_annotations_stubs / "fbp_capnp" / "__init__.py",
     ]
-    result = run_command(["basedpyright", *(str(path) for path in runtime_files)], cwd=REPO_ROOT)
-    assert result.returncode == 0, result.stdout or result.stderr
+    result = run_pyright(*runtime_files, cwd=REPO_ROOT, executable="basedpyright")
+    assert result.error_count == 0, result.stdout or result.stderr
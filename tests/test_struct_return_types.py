@@ -3,15 +3,21 @@
 import re
 from pathlib import Path
 
+import pytest
+
 from tests.test_helpers import read_generated_types_combined
 
 
-def test_client_result_uses_reader_only(basic_stubs: Path) -> None:
-    """Test that top-level client result helpers use Reader types only for structs."""
-    content = read_generated_types_combined(basic_stubs / "struct_return_capnp")
+@pytest.fixture(scope="module")
+def struct_return_content(basic_stubs: Path) -> str:
+    """Get pre-generated struct-return schema helper content once for the module."""
+    return read_generated_types_combined(basic_stubs / "struct_return_capnp")
 
+
+def test_client_result_uses_reader_only(struct_return_content: str) -> None:
+    """Test that top-level client result helpers use Reader types only for structs."""
     result_match = re.search(
-        r"class InfoResult\(Awaitable\[InfoResult\], Protocol\):(.*?)(?=\nclass |\Z)", content, re.DOTALL
+        r"class InfoResult\(Awaitable\[InfoResult\], Protocol\):(.*?)(?=\nclass |\Z)", struct_return_content, re.DOTALL
     )
     assert result_match, "InfoResult class not found in IdentifiableClient"
     result_content = result_match.group(1)
@@ -21,21 +27,19 @@ def test_client_result_uses_reader_only(basic_stubs: Path) -> None:
     assert "NestedBuilder" not in result_content, "Client result should not reference Builder"
 
 
-def test_server_result_uses_builder_and_reader(basic_stubs: Path) -> None:
+def test_server_result_uses_builder_and_reader(struct_return_content: str) -> None:
     """Test that direct struct returns use Builder types via CallContext and assignment-friendly tuple fields."""
-    content = read_generated_types_combined(basic_stubs / "struct_return_capnp")
+    assert "class InfoCallContext(Protocol):" in struct_return_content
+    assert "def results(self) -> builders.IdInformationBuilder: ..." in struct_return_content
+    assert "class InfoResultTuple(NamedTuple):" in struct_return_content
+    assert "nested: builders.NestedBuilder | readers.NestedReader | dict[str, Any]" in struct_return_content
 
-    assert "class InfoCallContext(Protocol):" in content
-    assert "def results(self) -> builders.IdInformationBuilder: ..." in content
-    assert "class InfoResultTuple(NamedTuple):" in content
-    assert "nested: builders.NestedBuilder | readers.NestedReader | dict[str, Any]" in content
 
-
-def test_server_named_tuple_has_nested_field(basic_stubs: Path) -> None:
+def test_server_named_tuple_has_nested_field(struct_return_content: str) -> None:
     """Test that server NamedTuple result has nested struct field."""
-    content = read_generated_types_combined(basic_stubs / "struct_return_capnp")
-
-    tuple_match = re.search(r"class InfoResultTuple\(NamedTuple\):(.*?)(?=\nclass |\Z)", content, re.DOTALL)
+    tuple_match = re.search(
+        r"class InfoResultTuple\(NamedTuple\):(.*?)(?=\nclass |\Z)", struct_return_content, re.DOTALL
+    )
     assert tuple_match, "InfoResultTuple class not found"
     tuple_content = tuple_match.group(1)
 
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from tests.test_helpers import run_command, run_pyright
+from tests.test_helpers import run_pyright, write_pyright_sample_project
 
 if TYPE_CHECKING:
     from pathlib import Path
@@ -50,11 +50,9 @@ def test_runtime_types_modules_are_placeholders(zalfmas_stubs: Path) -> None:
     assert "NamedTuple" in tuples_runtime
 
 
-def test_top_level_enum_runtime_annotations_type_check(zalfmas_stubs: Path) -> None:
+def test_top_level_enum_runtime_annotations_type_check(zalfmas_stubs: Path, tmp_path: Path) -> None:
     """Top-level enum runtime objects and schemas should type check through their stub annotations."""
-    test_file = zalfmas_stubs / "test_climate_enum_runtime_annotations.py"
-    test_file.write_text(
-        """
+    code = """
 from mas.schema.climate import climate_capnp
 from mas.schema.climate.climate_capnp.types.enums import ElementEnum, GCMEnum
 
@@ -71,15 +69,14 @@ element_schema = climate_capnp.Element.schema
 resolution_schema = climate_capnp.TimeSeries.Resolution.schema
 _ = element_schema.enumerants["tmin"]
 _ = resolution_schema.enumerants["daily"]
-""".lstrip(),
+""".lstrip()
+    [test_file] = write_pyright_sample_project(
+        tmp_path, {"test_climate_enum_runtime_annotations.py": code}, zalfmas_stubs
     )
 
-    try:
-        result = run_pyright(test_file, cwd=zalfmas_stubs)
-    finally:
-        test_file.unlink(missing_ok=True)
+    result = run_pyright(test_file, cwd=tmp_path)
 
-    error_count = result.stdout.count("error:")
+    error_count = result.error_count
     assert error_count == 0, f"Type checking failed:\n{result.stdout}"
 
 
@@ -96,11 +93,9 @@ def test_climate_schema_helpers_keep_precise_nested_element_types(zalfmas_stubs:
     assert "def elementType(self) -> _mas_schema_common_common_capnp_schemas._PairSchema: ..." in modules_stub
 
 
-def test_climate_schema_helper_chains_type_check_precisely(zalfmas_stubs: Path) -> None:
+def test_climate_schema_helper_chains_type_check_precisely(zalfmas_stubs: Path, tmp_path: Path) -> None:
     """Deep schema helper chains should preserve their concrete schema targets."""
-    test_file = zalfmas_stubs / "test_climate_precise_schema_helpers.py"
-    test_file.write_text(
-        """
+    code = """
 from mas.schema.climate import climate_capnp
 from mas.schema.climate.climate_capnp.types import schemas as climate_schemas
 from mas.schema.common.common_capnp.types import schemas as common_schemas
@@ -111,12 +106,11 @@ values_schema: common_schemas._IdInformationSchema = climate_capnp.Metadata.Supp
 for_all_schema: common_schemas._PairSchema = climate_capnp.Metadata.Information.schema.methods["forAll"].result_type.fields["all"].schema.elementType
 header_map_schema: common_schemas._PairSchema = climate_capnp.CSVTimeSeriesFactory.CSVConfig.schema.fields["headerMap"].schema.elementType
 _ = (header_schema, categories_schema, values_schema, for_all_schema, header_map_schema)
-""".lstrip(),
+""".lstrip()
+    [test_file] = write_pyright_sample_project(
+        tmp_path, {"test_climate_precise_schema_helpers.py": code}, zalfmas_stubs
     )
 
-    try:
-        result = run_command(["basedpyright", str(test_file)], cwd=zalfmas_stubs)
-    finally:
-        test_file.unlink(missing_ok=True)
+    result = run_pyright(test_file, cwd=tmp_path, executable="basedpyright")
 
-    assert result.returncode == 0, result.stdout or result.stderr
+    assert result.error_count == 0, result.stdout or result.stderr
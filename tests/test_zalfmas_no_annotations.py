@@ -95,5 +95,5 @@ def test_no_annotations_schema_packages_typecheck(zalfmas_no_annotations_stubs:
     )
 
     result = run_pyright(*schema_packages)
-    error_count = result.stdout.count("error:")
+    error_count = result.error_count
     assert error_count == 0, f"Pyright validation failed for no-annotation schema packages:\n{result.stdout}"
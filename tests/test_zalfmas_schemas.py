@@ -19,20 +19,19 @@ from tests.test_helpers import log_summary, run_generator
 # Test directories
 TESTS_DIR = Path(__file__).parent
 ZALFMAS_DIR = TESTS_DIR / "schemas" / "zalfmas"
-GENERATED_ZALFMAS_DIR = TESTS_DIR / "_generated" / "zalfmas"
 
 
 @pytest.fixture(scope="module")
-def generated_zalfmas_dir() -> Path:
-    """Ensure the generated zalfmas directory exists and is clean."""
-    if GENERATED_ZALFMAS_DIR.exists():
-        shutil.rmtree(GENERATED_ZALFMAS_DIR)
+def generated_zalfmas_dir(worker_generated_dir: Path) -> Path:
+    """Provide a clean output directory, private to the pytest-xdist worker, for this module's zalfmas run.
 
-    GENERATED_ZALFMAS_DIR.mkdir(parents=True, exist_ok=True)
-
-    return GENERATED_ZALFMAS_DIR
-
-    # Keep generated files for inspection
+    The session-wide zalfmas stubs under tests/_generated/zalfmas are shared by other modules, so they are never wiped here.
+    """
+    output_dir = worker_generated_dir / "zalfmas"
+    if output_dir.exists():
+        shutil.rmtree(output_dir)
+    output_dir.mkdir(parents=True)
+    return output_dir
 
 
 def test_generate_zalfmas_stubs(generated_zalfmas_dir: Path) -> None:
@@ -49,11 +48,14 @@ def test_generate_zalfmas_stubs(generated_zalfmas_dir: Path) -> None:
     if capnp_folder.exists():
         excludes.extend([str(f) for f in capnp_folder.glob("*.capnp")])
 
-    # Build arguments for the CLI
-    args = ["-p", str(ZALFMAS_DIR), "-o", str(generated_zalfmas_dir), "-I", str(ZALFMAS_DIR), "-r", "-e", *excludes]
-
-    # Call the CLI main function directly
-    run_generator(args)
+    # Call the generator in-process with the same options the CLI would pass
+    run_generator(
+        [str(ZALFMAS_DIR)],
+        generated_zalfmas_dir,
+        import_paths=[str(ZALFMAS_DIR)],
+        excludes=excludes,
+        recursive=True,
+    )
 
     # Verify stubs were generated
     generated_stubs = list(generated_zalfmas_dir.glob("**/__init__.pyi"))
@@ -62,7 +64,7 @@ def test_generate_zalfmas_stubs(generated_zalfmas_dir: Path) -> None:
     root_stubs = [s for s in generated_stubs if s.parent == generated_zalfmas_dir]
     subdir_stubs = [s for s in generated_stubs if s.parent != generated_zalfmas_dir]
     summary_lines = [
-        f"Generating stubs with args: {' '.join(args)}",
+        f"Generating stubs from {ZALFMAS_DIR} (recursive, {len(excludes)} excluded)",
         f"✓ Successfully generated {len(generated_stubs)} stub files",
         f"  - {len(root_stubs)} in root directory",
     ]